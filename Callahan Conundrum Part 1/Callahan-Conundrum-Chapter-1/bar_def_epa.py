@@ -8,11 +8,12 @@ from matplotlib.lines import Line2D
 import seaborn as sns
 import numpy as np
 import os
+from Data import load_metrics
 
 # -----------------------------
 # FILE AND OUTPUT SETUP
 # -----------------------------
-DATA_FILE = "Data/titans_metrics_final.csv"
+DATASET = "titans_metrics_final"
 POOP_IMG = "poop.png"
 OUTDIR = "outputs_final"
 os.makedirs(OUTDIR, exist_ok=True)
@@ -27,12 +28,8 @@ COLOR_OTHER = "#0C2340"
 # -----------------------------
 # LOAD DATA
 # -----------------------------
-def load_data():
-    df = pd.read_csv(DATA_FILE)
-    df.columns = df.columns.str.lower()
-    df["season"] = df["season"].astype(int)
-    df = df[(df["season"] >= 2018) & (df["season"] <= 2024)].copy()
-    return df
+def load_data(metric):
+    return load_metrics(DATASET, [metric], seasons=(2018, 2024))
 
 # =====================================================
 # CUSTOM LEGEND HANDLER (💩)
@@ -75,10 +72,10 @@ def poop_legend(ax):
 # =====================================================
 # MAIN ANALYSIS
 # =====================================================
-df = load_data()
-
 metric = "def_epa_per_play"
 
+df = load_data(metric)
+
 v23 = df[df["season"] == 2023][metric].iloc[0]
 v24 = df[df["season"] == 2024][metric].iloc[0]
 
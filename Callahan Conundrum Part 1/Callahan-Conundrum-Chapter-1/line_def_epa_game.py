@@ -6,14 +6,13 @@ import matplotlib.image as mpimg
 from matplotlib.legend_handler import HandlerBase
 from matplotlib.offsetbox import OffsetImage, AnnotationBbox
 import os
+from Data import load_metrics
 # =====================================================
 # LOAD GAME-LEVEL DATA
 # =====================================================
 OUTDIR = "outputs_final"
-df = pd.read_csv("Data/titans_epa_per_game.csv")
-
-# Keep only 2023 and 2024
-df = df[df["season"].isin([2023, 2024])]
+# Only 2023 and 2024, and only the columns plotted
+df = load_metrics("titans_epa_per_game", ["week", "def_epa_game"], seasons=(2023, 2024))
 
 # Sort properly
 df = df.sort_values(["season", "week"])
@@ -4,12 +4,13 @@ import seaborn as sns
 import matplotlib.image as mpimg
 from matplotlib.offsetbox import OffsetImage, AnnotationBbox
 import matplotlib.patheffects as pe
+from Data import load_dataset
 
 POOP_IMG = "poop.png"
 poop_img = mpimg.imread(POOP_IMG)
 
 # === Load the dataset ===
-df = pd.read_csv("Data/team_years.csv")
+df = load_dataset("team_years")
 
 # --- Filter for Titans/Oilers ---
 titans = df[df['team'] == 'oti'].copy()
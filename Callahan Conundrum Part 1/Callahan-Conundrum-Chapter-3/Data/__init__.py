@@ -0,0 +1,12 @@
+#Data/__init__.py
+
+#The datasets are built and stored once, in "Data 1" (see data_store.py
+#there). This package only points chapter scripts at that loader.
+import os
+import sys
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "Data 1"))
+if DATA_DIR not in sys.path:
+    sys.path.insert(0, DATA_DIR)
+
+from data_store import load_dataset, load_metrics, dataset_path
@@ -8,22 +8,19 @@ from matplotlib.offsetbox import OffsetImage, AnnotationBbox
 import os
 import numpy as np
 import matplotlib.patheffects as pe
+from Data import load_metrics
 
 # -----------------------------
 # FILES
 # -----------------------------
-DATA_FILE = "Data/titans_metrics_final.csv"
+DATASET = "titans_metrics_final"
 POOP_IMG = "poop.png"
 OUTDIR = "outputs_final"
 os.makedirs(OUTDIR, exist_ok=True)
 # -----------------------------
 # LOAD DATA
 # -----------------------------
-df = pd.read_csv(DATA_FILE)
-df.columns = df.columns.str.lower()
-df["season"] = df["season"].astype(int)
-
-df = df[(df["season"] >= 2000) & (df["season"] <= 2024)].copy()
+df = load_metrics(DATASET, ["def_epa_per_play"], seasons=(2000, 2024))
 
 # -----------------------------
 # ROLLING SMOOTHING
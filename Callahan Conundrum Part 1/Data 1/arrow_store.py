@@ -0,0 +1,178 @@
+#arrow_store.py
+
+#Content-addressed Arrow IPC cache for the project's CSV outputs.
+#Each CSV's bytes are hashed (SHA-256). The typed Arrow copy of that
+#content is stored once as arrow_cache/objects/<hash>.arrow, and scripts
+#open it memory-mapped instead of parsing text. Every reader shares the same
+#objects, whatever its working directory, because the cache lives next to
+#this file. Identical content is never converted twice.
+#The CSV stays the source of truth: when its bytes change it gets a new hash
+#and the old object simply stops being used (--prune deletes those).
+#arrow_cache/index.json remembers the hash for each CSV's size and mtime, so
+#an unchanged file is not re-read just to hash it.
+#Without pyarrow everything falls back to pd.read_csv.
+#
+#   python arrow_store.py titans_metrics_final.csv team_years.csv
+#   python arrow_store.py --prune
+import os
+import sys
+import glob
+import json
+import hashlib
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+ARROW_CACHE_DIR = os.environ.get(
+    "ARROW_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "arrow_cache")
+)
+HASH_CHUNK_BYTES = 1 << 20
+
+# Part of every object name. v2 objects are always built from the parsed CSV;
+# v1 ones could come from the frame that wrote it and are left to --prune.
+OBJECT_VERSION = "v2"
+
+# --------------------
+# Content hashes
+# --------------------
+def index_path():
+    return os.path.join(ARROW_CACHE_DIR, "index.json")
+
+def load_index():
+    try:
+        with open(index_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_index(index):
+    os.makedirs(ARROW_CACHE_DIR, exist_ok=True)
+    tmp = f"{index_path()}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(tmp, index_path())
+
+def csv_stamp(csv_path):
+    stat = os.stat(csv_path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+# SHA-256 of the CSV bytes, reused from the index while size and mtime match
+def content_hash(csv_path):
+    key = os.path.abspath(csv_path)
+    stamp = csv_stamp(csv_path)
+    index = load_index()
+    entry = index.get(key)
+    if entry and entry["stamp"] == stamp:
+        return entry["sha256"]
+
+    digest = hashlib.sha256()
+    with open(csv_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    index[key] = {"stamp": stamp, "sha256": digest.hexdigest()}
+    try:
+        save_index(index)
+    except OSError:
+        pass  # read-only checkout: hash again next time
+    return index[key]["sha256"]
+
+# --------------------
+# Paths
+# --------------------
+def object_path(digest):
+    return os.path.join(ARROW_CACHE_DIR, "objects", f"{digest}.{OBJECT_VERSION}.arrow")
+
+def arrow_path(csv_path):
+    return object_path(content_hash(csv_path))
+
+# --------------------
+# Publish
+# --------------------
+# Writes the uncompressed Arrow object for csv_path's current content.
+# Uncompressed buffers are what make the later memory-mapped read zero-copy.
+# The table is always pd.read_csv(csv_path) (pass it as df if already parsed),
+# so the object depends only on the CSV bytes, never on the frame that wrote them.
+def publish(csv_path, df=None):
+    if pa is None:
+        return None
+
+    path = arrow_path(csv_path)
+    if os.path.exists(path):
+        return path  # same content already converted
+
+    if df is None:
+        df = pd.read_csv(csv_path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Per-process temp name: several workers may publish the same object at once
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+    return path
+
+# --------------------
+# Read
+# --------------------
+def open_arrow(csv_path):
+    if pa is None or not os.path.exists(csv_path):
+        return None
+    path = arrow_path(csv_path)
+    if not os.path.exists(path):
+        return None
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+# Same result as pd.read_csv(csv_path), from the Arrow object when one exists
+# for the CSV's content. A missing one is built from the CSV for the next reader.
+def read_table(csv_path, columns=None):
+    table = open_arrow(csv_path)
+
+    if table is None:
+        df = pd.read_csv(csv_path)
+        try:
+            publish(csv_path, df)
+        except OSError:
+            pass  # read-only checkout, keep using the CSV
+        return df if columns is None else df[columns]
+
+    if columns is not None:
+        table = table.select(columns)
+    # split_blocks keeps each column in its own block, so numeric columns
+    # without nulls stay views onto the mapped file
+    return table.to_pandas(split_blocks=True)
+
+# --------------------
+# Prune
+# --------------------
+# Deletes objects no indexed CSV points at any more, and index entries for
+# CSVs that are gone or changed since they were hashed
+def prune():
+    index = load_index()
+    live = {}
+    for key, entry in index.items():
+        if os.path.exists(key) and csv_stamp(key) == entry["stamp"]:
+            live[key] = entry
+    save_index(live)
+
+    keep = {object_path(entry["sha256"]) for entry in live.values()}
+    stale = [p for p in glob.glob(os.path.join(ARROW_CACHE_DIR, "objects", "*.arrow")) if p not in keep]
+    for path in stale:
+        os.remove(path)
+    return len(stale)
+
+# --------------------
+# MAIN
+# --------------------
+if __name__ == "__main__":
+    if pa is None:
+        sys.exit("pyarrow is not installed")
+    if sys.argv[1:] == ["--prune"]:
+        print(f"Removed {prune()} unused objects from {ARROW_CACHE_DIR}")
+    else:
+        for csv_path in sys.argv[1:]:
+            print(f"{csv_path} -> {publish(csv_path)}")
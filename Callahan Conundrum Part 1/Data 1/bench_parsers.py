@@ -0,0 +1,92 @@
+#bench_parsers.py
+
+#Time the team-page parsers on saved HTML: pd.read_html (the old path)
+#against pfr_tables.extract_table. Pages come from a directory of .html files
+#or from the scraper's response cache (.body files), so no network is needed.
+#
+#   python bench_parsers.py
+#   python bench_parsers.py --pages fixtures/pfr --repeat 10
+import os
+import sys
+import glob
+import time
+import argparse
+from io import StringIO
+from statistics import median
+
+import pandas as pd
+
+from pfr_tables import extract_table
+from pfr_client import PFR_CACHE_DIR
+
+FRANCHISE_TABLE = "team_index"
+
+# --------------------
+# Parsers
+# --------------------
+def parse_read_html(page):
+    df = pd.read_html(StringIO(page), header=1)[0]
+    return df[df["Year"].astype(str).str.isnumeric()]
+
+def parse_lxml(page):
+    return extract_table(page, FRANCHISE_TABLE, key="Year")
+
+PARSERS = {
+    "read_html": parse_read_html,
+    "lxml": parse_lxml,
+}
+
+# --------------------
+# Fixtures
+# --------------------
+# Only pages that hold the franchise table count (the cache also has the index)
+def load_pages(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "**", "*.html"), recursive=True)
+                       + glob.glob(os.path.join(directory, "*.body"))):
+        with open(path, "rb") as f:
+            page = f.read().decode("utf-8", errors="replace")
+        if f'id="{FRANCHISE_TABLE}"' in page:
+            pages.append((path, page))
+    return pages
+
+# Both parsers must agree once written out, or the timing means nothing
+def same_output(a, b):
+    return a.to_csv(index=False) == b.to_csv(index=False)
+
+# --------------------
+# MAIN
+# --------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark team page parsers on saved HTML")
+    parser.add_argument("--pages", default=PFR_CACHE_DIR)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    pages = load_pages(args.pages)
+    if not pages:
+        print(f"No team pages with a {FRANCHISE_TABLE} table under {args.pages}")
+        return 1
+
+    mismatches = [p for p, page in pages if not same_output(parse_read_html(page), parse_lxml(page))]
+    for path in mismatches:
+        print(f"MISMATCH {path}")
+
+    medians = {}
+    for name, parse in PARSERS.items():
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for _, page in pages:
+                parse(page)
+            times.append(time.perf_counter() - start)
+        medians[name] = median(times)
+        print(f"{name:<10} {len(pages)} pages  median={medians[name]:.4f}s  "
+              f"per page={medians[name] / len(pages) * 1000:.2f}ms")
+
+    print(f"\nlxml is {medians['read_html'] / medians['lxml']:.1f}x faster, "
+          f"{len(pages) - len(mismatches)} of {len(pages)} pages identical")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#bench_pipeline.py
+
+#Time each pipeline stage on synthetic play-by-play at several sizes.
+#Results are appended to bench_history.jsonl and compared with the last run.
+#
+#   python bench_pipeline.py
+#   python bench_pipeline.py --seasons 1 10 --teams 32 --repeat 5
+#   python bench_pipeline.py --chart ../Callahan-Conundrum-Chapter-1/bar_off_epa.py
+import io
+import os
+import sys
+import glob
+import json
+import time
+import runpy
+import shutil
+import argparse
+import contextlib
+import platform
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from statistics import median
+
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
+
+import pbp_cache
+from team_metrics import compute_success, neutral_baseline, team_season_metrics, team_slice
+from season_store import upsert
+
+# --------------------
+# Config
+# --------------------
+HISTORY_FILE = "bench_history.jsonl"
+FIRST_SEASON = 2000
+TEAM = "TEN"
+
+# Chart rendered in the render stage; it reads the committed Titans metrics
+CHART_SCRIPT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "Callahan-Conundrum-Chapter-3", "line_off_epa.py"
+)
+
+# --------------------
+# Timing helper
+# --------------------
+# setup runs before each repeat, outside the timed part
+def timed(fn, repeat, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, times
+
+# --------------------
+# Stages
+# --------------------
+# Runs a chapter chart script as it runs on its own, but from a scratch
+# directory so its outputs_final/ lands there instead of over the real charts
+def chart_runner(script, workdir):
+    chapter = os.path.dirname(os.path.abspath(script))
+    scratch = os.path.join(workdir, "chart")
+    os.makedirs(scratch, exist_ok=True)
+    for image in glob.glob(os.path.join(chapter, "*.png")):
+        shutil.copy(image, scratch)
+
+    def render():
+        cwd = os.getcwd()
+        sys.path.insert(0, chapter)  # for the chapter's Data package
+        os.chdir(scratch)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                runpy.run_path(script, run_name="__main__")
+        finally:
+            os.chdir(cwd)
+            sys.path.remove(chapter)
+    return render
+
+def bench_size(n_seasons, n_teams, repeat, workdir, chart=CHART_SCRIPT):
+    years = list(range(FIRST_SEASON, FIRST_SEASON + n_seasons))
+    results = {}
+
+    # Ingestion: first fill of the cache (generate + schema + Parquet write),
+    # then the warm path every later run takes
+    def fetch():
+        for year in years:
+            pbp_cache.ensure_partition(year, refresh=True)
+    _, results["ingest_fetch"] = timed(fetch, 1)
+
+    pbp, results["ingest_cache_read"] = timed(lambda: pbp_cache.load_pbp_seasons(years), repeat)
+
+    # Metrics are always built for the whole league (PROE needs every team's
+    # plays); one team is a slice of that table, as in titans_metrics_1.py
+    _, results["success_flag"] = timed(lambda: compute_success(pbp), repeat)
+    baseline, results["proe_baseline"] = timed(lambda: neutral_baseline(pbp), repeat)
+    season_df, results["aggregate"] = timed(lambda: team_season_metrics(pbp, baseline=baseline), repeat)
+
+    keys = ["season", "team"]
+    if n_teams == 1:
+        season_df, results["team_slice"] = timed(lambda: team_slice(season_df, TEAM), repeat)
+        keys = ["season"]
+
+    # Every repeat writes a new file; deleting the last one is not timed
+    csv_path = os.path.join(workdir, f"metrics_{n_seasons}_{n_teams}.csv")
+    def remove():
+        if os.path.exists(csv_path):
+            os.remove(csv_path)
+    _, results["csv_write"] = timed(lambda: upsert(csv_path, season_df, keys=keys), repeat, setup=remove)
+
+    if n_teams == 1:
+        _, results["render_chart"] = timed(chart_runner(chart, workdir), repeat)
+
+    return results, len(pbp)
+
+# --------------------
+# History
+# --------------------
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+def read_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def previous_run(history):
+    runs = sorted({r["run_id"] for r in history})
+    if not runs:
+        return {}
+    last = runs[-1]
+    return {
+        (r["stage"], r["seasons"], r["teams"]): r["median_s"]
+        for r in history if r["run_id"] == last
+    }
+
+# --------------------
+# MAIN
+# --------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the play-by-play pipeline stages")
+    parser.add_argument("--seasons", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--teams", type=int, nargs="+", default=[1, 32], choices=[1, 32])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--history", default=HISTORY_FILE)
+    parser.add_argument("--chart", default=CHART_SCRIPT, help="chapter chart script for the render stage")
+    args = parser.parse_args(argv)
+
+    previous = previous_run(read_history(args.history))
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    meta = {
+        "run_id": run_id,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+    records = []
+    with tempfile.TemporaryDirectory() as workdir:
+        # Synthetic data in a throwaway cache, never the real one
+        pbp_cache.PBP_SOURCE = "synthetic"
+        pbp_cache.CACHE_DIR = os.path.join(workdir, "pbp_cache")
+
+        for n_seasons in args.seasons:
+            for n_teams in args.teams:
+                results, rows = bench_size(n_seasons, n_teams, args.repeat, workdir, args.chart)
+                for stage, times in results.items():
+                    record = dict(meta, stage=stage, seasons=n_seasons, teams=n_teams, rows=rows,
+                                  min_s=min(times), median_s=median(times), repeats=len(times))
+                    records.append(record)
+
+                    before = previous.get((stage, n_seasons, n_teams))
+                    change = f"{record['median_s'] / before:6.2f}x" if before else "     -"
+                    print(f"{stage:<18} seasons={n_seasons:<4} teams={n_teams:<3} "
+                          f"median={record['median_s']:.4f}s  vs last: {change}")
+
+    with open(args.history, "a") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    print(f"\nAppended {len(records)} results to {args.history}")
+
+if __name__ == "__main__":
+    sys.exit(main())
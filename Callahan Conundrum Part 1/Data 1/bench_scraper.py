@@ -0,0 +1,99 @@
+#bench_scraper.py
+
+#Time the team page scrape against recorded pages served by pfr_standin.py,
+#so no request reaches the real site. Each concurrency level is run twice:
+#cold (empty response cache, every page downloaded) and warm (every page
+#revalidated with a conditional GET). The parsed table must match between
+#runs, and pages lost to injected errors are reported.
+#
+#   python pfr_standin.py record recorded_pfr/ --from-cache pfr_cache
+#   python bench_scraper.py recorded_pfr/ --latency 0.2 --concurrency 1 4 8
+#   python bench_scraper.py recorded_pfr/ --error-rate 0.2 --throttle-rate 0.1
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+
+import pandas as pd
+
+from pfr_client import PFRClient, fetch_pages
+from pfr_standin import start_in_background, DEFAULT_DIR
+from team_years import team_codes_from_index, parse_team_page
+
+# The stand-in is local, so the crawl limit is lifted; --rpm puts it back
+DEFAULT_RPM = 60_000
+
+# --------------------
+# One scrape
+# --------------------
+async def scrape(client):
+    team_codes = team_codes_from_index(await client.get_text("/teams/"))
+    pages = await fetch_pages([f"/teams/{team}/" for team in team_codes], client)
+    return team_codes, pages
+
+def run_once(base_url, cache_dir, concurrency, rpm):
+    client = PFRClient(base_url, requests_per_minute=rpm, concurrency=concurrency, cache_dir=cache_dir)
+    start = time.perf_counter()
+    try:
+        team_codes, pages = asyncio.run(scrape(client))
+    finally:
+        client.close()
+    fetched = time.perf_counter() - start
+
+    table = pd.concat(
+        [parse_team_page(pages[f"/teams/{team}/"], team) for team in team_codes],
+        ignore_index=True,
+    )
+    parsed = time.perf_counter() - start - fetched
+    return table, fetched, parsed, client.stats
+
+# --------------------
+# MAIN
+# --------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the team page scraper against the PFR stand-in")
+    parser.add_argument("directory", nargs="?", default=DEFAULT_DIR)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--rpm", type=float, default=DEFAULT_RPM, help="client requests per minute")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    server, base_url = start_in_background(
+        args.directory, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+    )
+    print(f"Stand-in at {base_url} (latency {args.latency}s, errors {args.error_rate:.0%}, "
+          f"429s {args.throttle_rate:.0%})\n")
+
+    reference = None
+    failed = 0
+    try:
+        for concurrency in args.concurrency:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                for label in ("cold", "warm"):
+                    try:
+                        table, fetched, parsed, stats = run_once(base_url, cache_dir, concurrency, args.rpm)
+                    except Exception as e:
+                        print(f"concurrency={concurrency:<3} {label}  FAILED: {e}")
+                        failed += 1
+                        continue
+
+                    csv = table.to_csv(index=False)
+                    same = reference is None or csv == reference
+                    reference = reference or csv
+                    print(f"concurrency={concurrency:<3} {label}  fetch={fetched:.2f}s  parse={parsed:.2f}s  "
+                          f"downloaded={stats['downloaded']}  unchanged={stats['not_modified']}  "
+                          f"rows={len(table)}{'' if same else '  MISMATCH'}")
+                    failed += not same
+    finally:
+        server.shutdown()
+
+    print(f"\nServer responses: {dict(sorted(server.statuses.items()))}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
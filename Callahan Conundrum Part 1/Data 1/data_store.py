@@ -0,0 +1,64 @@
+#data_store.py
+
+#One loader for every dataset the project builds. The CSVs are built and
+#stored only in this directory. Chapter scripts ask for a dataset by name
+#and read it through the content-addressed Arrow cache (arrow_store.py),
+#so every chapter reads the same copy and shares one warm cache.
+#
+#   from Data import load_dataset           # in a chapter directory
+#   df = load_dataset("titans_metrics_final")
+#   df = load_metrics("titans_metrics_final", ["srs"], seasons=(2018, 2024))
+#   python data_store.py                    # list datasets and content hashes
+import os
+
+from arrow_store import read_table, content_hash
+from metrics_store import read_metrics, METRICS_FILES
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Dataset name -> (file in DATA_DIR, script that builds it)
+DATASETS = {
+    "team_years": ("team_years.csv", "team_years.py"),
+    "team_dim": ("team_dim.csv", "team_dim.py"),
+    "team_games": ("team_games.csv", "team_games.py"),
+    "team_metrics_1": ("team_metrics_1.csv", "titans_metrics_1.py"),
+    "titans_metrics_1": ("titans_metrics_1.csv", "titans_metrics_1.py"),
+    "team_metrics_final": ("team_metrics_final.csv", "titans_metrics_final.py"),
+    "titans_metrics_final": ("titans_metrics_final.csv", "titans_metrics_final.py"),
+    "titans_epa_per_game": ("titans_epa_per_game.csv", "titans_epa_per_game.py"),
+}
+
+# --------------------
+# Loader
+# --------------------
+def dataset_path(name):
+    if name not in DATASETS:
+        raise KeyError(f"Unknown dataset {name!r}; known datasets: {sorted(DATASETS)}")
+    return os.path.join(DATA_DIR, DATASETS[name][0])
+
+def load_dataset(name, columns=None):
+    path = dataset_path(name)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} has not been built; run {DATASETS[name][1]} in {DATA_DIR}")
+    return read_table(path, columns=columns)
+
+# Typed, lowercase metrics (see metrics_store.py): only season plus the
+# requested columns are read, and only for seasons in the (first, last) range
+def load_metrics(name, columns=None, seasons=None):
+    path = dataset_path(name)
+    if os.path.basename(path) not in METRICS_FILES:
+        raise KeyError(f"{name!r} has no metrics schema; use load_dataset")
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} has not been built; run {DATASETS[name][1]} in {DATA_DIR}")
+    return read_metrics(path, columns=columns, seasons=seasons)
+
+# --------------------
+# MAIN
+# --------------------
+if __name__ == "__main__":
+    for name, (file, script) in DATASETS.items():
+        path = dataset_path(name)
+        if os.path.exists(path):
+            print(f"{name:<22} {content_hash(path)[:12]}  {os.path.getsize(path) / 1024:>7.0f} KB  ({script})")
+        else:
+            print(f"{name:<22} {'not built':<12}  {'':>10}  ({script})")
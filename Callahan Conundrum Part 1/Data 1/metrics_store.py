@@ -0,0 +1,160 @@
+#metrics_store.py
+
+#Typed Parquet copies of the metrics outputs, for the chart scripts.
+#Each metrics CSV has an explicit schema with lowercase names: season is an
+#int16, counts and points are integers, rates are float64 and labels are
+#strings. It is written as <name>.parquet next to the CSV and stamped with
+#the CSV's content hash. read_metrics reads only the requested columns
+#(season is always included) and skips rows outside a season range while
+#reading. A chart that plots one metric reads one column plus season.
+#Missing or stale Parquet files are rebuilt from the CSV. Without pyarrow the
+#CSV is read and trimmed the same way.
+#
+#   python metrics_store.py            # (re)write every metrics Parquet file
+import os
+import sys
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+from arrow_store import content_hash
+
+HASH_KEY = b"csv_sha256"
+
+# The outputs that have a schema below
+METRICS_FILES = ["titans_metrics_final.csv", "team_metrics_final.csv", "titans_epa_per_game.csv"]
+
+# --------------------
+# Schemas
+# --------------------
+def season_fields():
+    return [
+        ("season", pa.int16()),
+        ("plays", pa.int32()),
+        ("off_epa_per_play", pa.float64()),
+        ("off_early_epa_per_play", pa.float64()),
+        ("off_success_rate_pct", pa.float64()),
+        ("def_epa_per_play", pa.float64()),
+        ("def_early_epa_per_play", pa.float64()),
+        ("def_success_rate_pct", pa.float64()),
+        ("proe_pct_points", pa.float64()),
+    ]
+
+def pfr_fields():
+    return [
+        ("tm", pa.string()),
+        ("coaches", pa.string()),
+        ("osrs", pa.float64()),
+        ("dsrs", pa.float64()),
+        ("srs", pa.float64()),
+        ("pf", pa.int16()),
+        ("pa", pa.int16()),
+        ("pd", pa.int16()),
+    ]
+
+# CSV file name -> schema, built lazily so the module imports without pyarrow
+def metrics_schemas():
+    season = season_fields()
+    return {
+        "titans_metrics_final.csv": pa.schema(season + pfr_fields()),
+        "team_metrics_final.csv": pa.schema(season[:1] + [("team", pa.string())] + season[1:] + pfr_fields()),
+        "titans_epa_per_game.csv": pa.schema([
+            ("season", pa.int16()),
+            ("game_id", pa.string()),
+            ("off_epa_game", pa.float64()),
+            ("week", pa.int8()),
+            ("off_rolling3", pa.float64()),
+            ("def_epa_game", pa.float64()),
+            ("def_rolling3", pa.float64()),
+        ]),
+    }
+
+def parquet_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+# --------------------
+# Write
+# --------------------
+# Rewrites the typed copy of csv_path from the CSV itself, so the Parquet file
+# always holds exactly what the CSV does
+def publish_metrics(csv_path):
+    if pa is None:
+        return None
+    schema = metrics_schemas()[os.path.basename(csv_path)]
+
+    df = pd.read_csv(csv_path)
+    df.columns = df.columns.str.lower()
+    table = pa.Table.from_pandas(df[schema.names], schema=schema, preserve_index=False)
+    table = table.replace_schema_metadata({HASH_KEY: content_hash(csv_path).encode()})
+
+    path = parquet_path(csv_path)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp)
+    os.replace(tmp, path)
+    return path
+
+# Current = made from this CSV content with the schema defined here
+def is_current(csv_path):
+    path = parquet_path(csv_path)
+    if not os.path.exists(path):
+        return False
+    stored = pq.read_schema(path)
+    schema = metrics_schemas()[os.path.basename(csv_path)]
+    return (
+        (stored.metadata or {}).get(HASH_KEY) == content_hash(csv_path).encode()
+        and stored.remove_metadata().equals(schema)
+    )
+
+# --------------------
+# Read
+# --------------------
+# seasons is an inclusive (first, last) range; None reads every season
+def read_metrics(csv_path, columns=None, seasons=None):
+    wanted = None if columns is None else ["season"] + [c for c in columns if c != "season"]
+
+    if pa is None:
+        df = pd.read_csv(csv_path)
+        df.columns = df.columns.str.lower()
+        if seasons is not None:
+            df = df[df["season"].between(*seasons)]
+        return (df if wanted is None else df[wanted]).reset_index(drop=True)
+
+    if not is_current(csv_path):
+        try:
+            publish_metrics(csv_path)
+        except OSError:
+            # Read-only checkout: type the CSV in memory instead
+            return read_metrics_csv(csv_path, wanted, seasons).to_pandas()
+
+    filters = None
+    if seasons is not None:
+        filters = [("season", ">=", seasons[0]), ("season", "<=", seasons[1])]
+    return pq.read_table(parquet_path(csv_path), columns=wanted, filters=filters).to_pandas()
+
+def read_metrics_csv(csv_path, wanted, seasons):
+    schema = metrics_schemas()[os.path.basename(csv_path)]
+    df = pd.read_csv(csv_path)
+    df.columns = df.columns.str.lower()
+    if seasons is not None:
+        df = df[df["season"].between(*seasons)]
+    names = wanted or schema.names
+    return pa.Table.from_pandas(
+        df[names], schema=pa.schema([schema.field(n) for n in names]), preserve_index=False
+    )
+
+# --------------------
+# MAIN
+# --------------------
+if __name__ == "__main__":
+    if pa is None:
+        sys.exit("pyarrow is not installed")
+    for csv_path in METRICS_FILES:
+        if os.path.exists(csv_path):
+            print(f"{csv_path} -> {publish_metrics(csv_path)}")
+        else:
+            print(f"{csv_path} not built yet")
@@ -0,0 +1,10 @@
+#nfl_calendar.py
+
+#Season arithmetic shared by the play-by-play cache and the PFR scrapers.
+#No dependencies beyond the standard library, so either side can import it.
+from datetime import datetime
+
+def current_season(today=None):
+    # NFL seasons kick off in September and finish in the next calendar year
+    today = today or datetime.now()
+    return today.year if today.month >= 9 else today.year - 1
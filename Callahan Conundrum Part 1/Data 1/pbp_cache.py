@@ -0,0 +1,383 @@
+#pbp_cache.py
+
+#Local on-disk cache of nflverse play-by-play, one Parquet partition per season
+import os
+import json
+import hashlib
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+import synthetic_pbp
+import pbp_download
+
+from team_metrics import SUCCESS_INPUTS, compute_success, neutral_baseline, combine_baselines
+from pbp_schema import SCHEMA_VERSION, apply_schema
+from nfl_calendar import current_season
+from pipeline_trace import stage
+
+# --------------------
+# Config
+# --------------------
+# "nflverse" downloads real play-by-play (see pbp_download.py), "nfl_data_py"
+# goes through that package instead, and "synthetic" generates it offline
+# (see synthetic_pbp.py) and keeps it in a separate cache directory.
+PBP_SOURCE = os.environ.get("PBP_SOURCE", "nflverse")
+
+DEFAULT_CACHE_DIR = "pbp_cache" if PBP_SOURCE in ("nflverse", "nfl_data_py") else f"pbp_cache_{PBP_SOURCE}"
+CACHE_DIR = os.environ.get("PBP_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+# The in-progress season is re-downloaded once its partition is older than this
+CURRENT_SEASON_MAX_AGE_HOURS = 12
+
+# Rows per Parquet row group, which is also the chunk size for streaming reads
+ROW_GROUP_SIZE = 8192
+
+# Rows are stored grouped by offense, so the posteam statistics of each row
+# group let team queries skip most of a season (see pbp_query.py)
+SORT_KEY = "posteam"
+
+# --------------------
+# Season helpers
+# --------------------
+def partition_dir(year):
+    return os.path.join(CACHE_DIR, f"season={year}")
+
+def partition_path(year):
+    return os.path.join(partition_dir(year), "pbp.parquet")
+
+def manifest_path(year):
+    return os.path.join(partition_dir(year), "manifest.json")
+
+def baseline_path(year):
+    return os.path.join(partition_dir(year), "neutral_baseline.parquet")
+
+# --------------------
+# Manifest
+# --------------------
+# Each partition keeps its own manifest.json so parallel workers never write
+# the same file. read_manifest() collects them into one view.
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def file_stamp(path):
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+def read_entry(year):
+    path = manifest_path(year)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def read_manifest():
+    entries = {}
+    if not os.path.isdir(CACHE_DIR):
+        return entries
+    for name in sorted(os.listdir(CACHE_DIR)):
+        if name.startswith("season="):
+            entry = read_entry(int(name.split("=")[1]))
+            if entry is not None:
+                entries[entry["season"]] = entry
+    return entries
+
+def write_entry(year, entry):
+    tmp = manifest_path(year) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(entry, f, indent=2)
+    os.replace(tmp, manifest_path(year))
+
+# --------------------
+# Freshness
+# --------------------
+def fetched_within(entry, hours, now=None):
+    now = now or datetime.now(timezone.utc)
+    fetched_at = datetime.fromisoformat(entry["fetched_at"])
+    return (now - fetched_at).total_seconds() < hours * 3600
+
+def is_fresh(year, entry, now=None):
+    if entry is None:
+        return False
+
+    # A season that came back without plays is not asked for again until the
+    # in-progress window passes, whichever season it is
+    if entry.get("empty"):
+        return fetched_within(entry, CURRENT_SEASON_MAX_AGE_HOURS, now)
+
+    if not os.path.exists(partition_path(year)):
+        return False
+
+    # A partition that no longer matches its hash is treated as missing
+    if not partition_intact(year, entry):
+        return False
+
+    # Closed seasons never change
+    if year < current_season(now):
+        return True
+
+    return fetched_within(entry, CURRENT_SEASON_MAX_AGE_HOURS, now)
+
+# Size and mtime unchanged since the hash was taken means the file is too, so
+# only a changed stamp costs a full read. A partition that still hashes the
+# same gets its new stamp recorded.
+def partition_intact(year, entry):
+    stamp = file_stamp(partition_path(year))
+    if entry.get("stamp") == stamp:
+        return True
+    if file_hash(partition_path(year)) != entry["sha256"]:
+        return False
+    try:
+        write_entry(year, dict(entry, stamp=stamp))
+    except OSError:
+        pass  # read-only cache: hash again next time
+    return True
+
+# --------------------
+# Column projection
+# --------------------
+# columns=None means every play-by-play column. The manifest records which
+# columns a partition holds so a narrower request can be served from it.
+
+# Columns computed once at fetch time and stored with the partition,
+# mapped to the nflverse columns they are built from
+DERIVED_COLUMNS = {
+    "success_flag": SUCCESS_INPUTS,
+    "game_key": ["game_id"],
+}
+
+def source_columns(columns):
+    if columns is None:
+        return None
+    out = []
+    for c in columns:
+        out += DERIVED_COLUMNS.get(c, [c])
+    return list(dict.fromkeys(out))
+
+def add_derived_columns(pbp):
+    if all(c in pbp.columns for c in SUCCESS_INPUTS):
+        pbp["success_flag"] = compute_success(pbp)
+    return pbp
+
+def normalize_columns(columns):
+    if columns is None:
+        return None
+    return ["season"] + [c for c in dict.fromkeys(columns) if c != "season"]
+
+def covers(entry, columns):
+    if entry.get("columns") is None:
+        return True
+    return columns is not None and set(columns) <= set(entry["columns"])
+
+def fetch_columns(entry, columns):
+    # Widen an existing partition instead of replacing it with a narrower one
+    if columns is None or entry is None or entry.get("columns") is None:
+        return columns
+    return normalize_columns(entry["columns"] + columns)
+
+# --------------------
+# Fetch + store
+# --------------------
+# Imported on first use, so the other sources work without nfl_data_py installed
+def nfl_data_py_import(*args, **kwargs):
+    from nfl_data_py import import_pbp_data
+    return import_pbp_data(*args, **kwargs)
+
+SOURCES = {
+    "nflverse": pbp_download.import_pbp_data,
+    "nfl_data_py": nfl_data_py_import,
+    "synthetic": synthetic_pbp.import_pbp_data,
+}
+
+def fetch_season(year, columns=None):
+    source = SOURCES[PBP_SOURCE]
+
+    # Participation data is not used by any metric, skip the second download
+    try:
+        pbp = source([year], columns=columns, downcast=True, include_participation=False)
+    except TypeError:
+        pbp = source(year, columns=columns, downcast=True, include_participation=False)
+    return pbp
+
+def sort_rows(pbp):
+    if SORT_KEY not in pbp.columns:
+        return pbp
+    # Stable, so plays keep their game order within each offense
+    return pbp.sort_values(SORT_KEY, kind="stable").reset_index(drop=True)
+
+def write_partition(year, pbp, columns=None):
+    os.makedirs(partition_dir(year), exist_ok=True)
+
+    tmp = partition_path(year) + ".tmp"
+    pbp.to_parquet(tmp, index=False, row_group_size=ROW_GROUP_SIZE)
+    os.replace(tmp, partition_path(year))
+
+    entry = {
+        "season": year,
+        "fetched_at": datetime.now(timezone.utc).isoformat(),
+        "sha256": file_hash(partition_path(year)),
+        "stamp": file_stamp(partition_path(year)),
+        "rows": len(pbp),
+        "columns": columns,
+        "schema": SCHEMA_VERSION,
+        "sorted_by": SORT_KEY if SORT_KEY in pbp.columns else None,
+    }
+    write_entry(year, entry)
+    return entry
+
+# Records that the season has no plays, so the next caller skips it instead
+# of downloading it again
+def write_empty_entry(year):
+    os.makedirs(partition_dir(year), exist_ok=True)
+    if os.path.exists(partition_path(year)):
+        os.remove(partition_path(year))
+    entry = {
+        "season": year,
+        "fetched_at": datetime.now(timezone.utc).isoformat(),
+        "rows": 0,
+        "empty": True,
+        "columns": None,
+        "schema": SCHEMA_VERSION,
+    }
+    write_entry(year, entry)
+    return entry
+
+def needs_fetch(year, columns=None, refresh=False):
+    columns = normalize_columns(columns)
+    entry = read_entry(year)
+    return refresh or not is_fresh(year, entry) or not covers(entry, columns)
+
+# Downloads every season that needs fetching up front, MAX_IN_FLIGHT at a time,
+# so workers read local files instead of each downloading on its own.
+# Returns {year: error} for the seasons that could not be downloaded.
+def prefetch_seasons(years, columns=None, refresh=False):
+    if PBP_SOURCE != "nflverse":
+        return {}
+    todo = [y for y in years if needs_fetch(y, columns=columns, refresh=refresh)]
+
+    # A season cached before is being replaced, so a season file or .part
+    # left over from an earlier download is stale and must not be reused
+    for year in todo:
+        if refresh or read_entry(year) is not None:
+            pbp_download.discard_raw(year)
+
+    if todo:
+        print(f"Downloading {len(todo)} seasons, {pbp_download.MAX_IN_FLIGHT} at a time...")
+    _, failures = pbp_download.download_seasons(todo)
+    return failures
+
+# Returned by ensure_partition for a season without plays
+EMPTY = "empty"
+
+# Makes sure the partition on disk is fresh and holds the requested columns.
+# Returns the fetched frame, None when the cached partition was usable, or
+# EMPTY when the season has no plays (fetched now or recorded earlier).
+def ensure_partition(year, columns=None, refresh=False):
+    columns = normalize_columns(columns)
+    entry = read_entry(year)
+
+    if not needs_fetch(year, columns=columns, refresh=refresh):
+        if entry.get("empty"):
+            return EMPTY
+        if needs_resort(entry):
+            resort_partition(year, entry)
+        return None
+
+    print(f"Fetching {year} from {PBP_SOURCE}...")
+    stored = fetch_columns(entry, columns)
+    pbp = fetch_season(year, columns=source_columns(stored))
+    if pbp is None or len(pbp) == 0:
+        write_empty_entry(year)
+        return EMPTY
+
+    pbp["season"] = year
+    # Computed once here and stored, so cached reads never recompute it
+    with stage("success_flag", season=year) as rec:
+        pbp = add_derived_columns(pbp)
+        rec["rows"] = len(pbp)
+
+    # Stored with the compact schema so every later read gets it for free
+    pbp = apply_schema(pbp)
+    if stored is not None:
+        pbp = pbp[[c for c in stored if c in pbp.columns]]
+    pbp = sort_rows(pbp)
+    write_partition(year, pbp, columns=stored)
+
+    # The downloaded season file is no longer needed once it is cached
+    if PBP_SOURCE == "nflverse":
+        pbp_download.discard_raw(year)
+    return pbp
+
+# Partitions cached before rows were sorted are rewritten in place, no download
+def needs_resort(entry):
+    has_key = entry.get("columns") is None or SORT_KEY in entry["columns"]
+    return has_key and entry.get("sorted_by") != SORT_KEY
+
+def resort_partition(year, entry):
+    pbp = sort_rows(apply_schema(pd.read_parquet(partition_path(year))))
+    new_entry = write_partition(year, pbp, columns=entry.get("columns"))
+    write_entry(year, dict(entry, **{k: new_entry[k] for k in ("sha256", "stamp", "sorted_by")}))
+
+def load_pbp(year, columns=None, refresh=False):
+    columns = normalize_columns(columns)
+    pbp = ensure_partition(year, columns=columns, refresh=refresh)
+
+    if pbp is EMPTY:
+        return None
+    if pbp is None:
+        # apply_schema is a no-op on partitions written with the current schema
+        return apply_schema(pd.read_parquet(partition_path(year), columns=columns))
+    return pbp if columns is None else pbp[[c for c in columns if c in pbp.columns]]
+
+# Yields the season one Parquet row group at a time, so memory stays at one
+# chunk regardless of season size
+def iter_pbp_chunks(year, columns=None, refresh=False):
+    columns = normalize_columns(columns)
+    if ensure_partition(year, columns=columns, refresh=refresh) is EMPTY:
+        return
+
+    parquet = pq.ParquetFile(partition_path(year))
+    for i in range(parquet.num_row_groups):
+        yield apply_schema(parquet.read_row_group(i, columns=columns).to_pandas())
+
+def load_pbp_seasons(years, columns=None, refresh=False):
+    frames = [load_pbp(year, columns=columns, refresh=refresh) for year in years]
+    frames = [f for f in frames if f is not None and len(f) > 0]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+# --------------------
+# League neutral baseline
+# --------------------
+# Stored per season at the down / distance-bucket grain, next to the
+# partition it was built from. It is rebuilt whenever that partition's
+# hash changes (a refreshed in-progress season, for instance).
+BASELINE_COLUMNS = ["season", "down", "ydstogo", "qtr", "score_differential", "play_type", "pass"]
+BASELINE_SPLIT = ("down", "distance_bucket")
+
+def load_neutral_baseline(year, refresh=False):
+    if ensure_partition(year, columns=BASELINE_COLUMNS, refresh=refresh) is EMPTY:
+        return None
+    entry = read_entry(year)
+
+    path = baseline_path(year)
+    if os.path.exists(path) and entry.get("baseline_source") == entry["sha256"]:
+        return pd.read_parquet(path)
+
+    baseline = combine_baselines(
+        [neutral_baseline(chunk, by=BASELINE_SPLIT) for chunk in iter_pbp_chunks(year, columns=BASELINE_COLUMNS)],
+        by=BASELINE_SPLIT
+    )
+    tmp = path + ".tmp"
+    baseline.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+    entry["baseline_source"] = entry["sha256"]
+    write_entry(year, entry)
+    return baseline
@@ -0,0 +1,212 @@
+#pbp_download.py
+
+#Concurrent, resumable downloads of nflverse season files.
+#At most MAX_IN_FLIGHT requests run at once. Failed requests are retried with
+#exponential backoff, and a partial file is resumed with an HTTP Range request
+#instead of starting over. Point PBP_BASE_URL at standin_server.py to run
+#the whole thing against local files.
+import os
+import json
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import requests
+
+# --------------------
+# Config
+# --------------------
+PBP_BASE_URL = os.environ.get(
+    "PBP_BASE_URL", "https://github.com/nflverse/nflverse-data/releases/download/pbp"
+)
+
+# Downloads land here first and are deleted once the season is cached as a partition
+RAW_DIR = os.environ.get("PBP_RAW_DIR", "pbp_raw")
+
+MAX_IN_FLIGHT = int(os.environ.get("PBP_MAX_IN_FLIGHT", 4))
+MAX_ATTEMPTS = 6
+BACKOFF_BASE_S = 1.0
+BACKOFF_MAX_S = 60.0
+TIMEOUT_S = (10, 60)  # connect, read
+CHUNK_BYTES = 1 << 16
+
+# Worth another try; anything else (404 for a season not published yet) is final
+RETRY_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+class DownloadError(Exception):
+    pass
+
+class RetryableStatus(requests.RequestException):
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+# --------------------
+# Paths
+# --------------------
+def season_url(year):
+    return f"{PBP_BASE_URL}/play_by_play_{year}.parquet"
+
+def raw_path(year):
+    return os.path.join(RAW_DIR, f"play_by_play_{year}.parquet")
+
+def part_path(year):
+    return raw_path(year) + ".part"
+
+# The ETag / Last-Modified of the file a .part belongs to, so a resume never
+# splices the tail of a newer upload onto the head of an older one
+def validator_path(year):
+    return part_path(year) + ".json"
+
+def read_validator(year):
+    if not os.path.exists(validator_path(year)):
+        return None
+    with open(validator_path(year)) as f:
+        return json.load(f).get("validator")
+
+def write_validator(year, validator):
+    with open(validator_path(year), "w") as f:
+        json.dump({"validator": validator}, f)
+
+def discard_raw(year):
+    for path in (raw_path(year), part_path(year), validator_path(year)):
+        if os.path.exists(path):
+            os.remove(path)
+
+# --------------------
+# Backoff
+# --------------------
+# Full jitter: a random wait up to base * 2^attempt, so retries from parallel
+# downloads do not all hit the server again at the same moment
+def backoff_delay(attempt, retry_after=None):
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_MAX_S)
+    return random.uniform(0, min(BACKOFF_MAX_S, BACKOFF_BASE_S * 2 ** attempt))
+
+def retry_after_seconds(response):
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+# --------------------
+# One request
+# --------------------
+# Fetches whatever is still missing from the .part file. Raises
+# requests.RequestException (retryable) or DownloadError (final).
+def fetch_remaining(year, session):
+    part = part_path(year)
+    have = os.path.getsize(part) if os.path.exists(part) else 0
+    validator = read_validator(year)
+
+    headers = {}
+    if have and validator:
+        headers["Range"] = f"bytes={have}-"
+        headers["If-Range"] = validator
+
+    with session.get(season_url(year), headers=headers, stream=True, timeout=TIMEOUT_S) as r:
+        if r.status_code == 416:
+            # Range starts past the end: the .part is already the whole file
+            return
+        if r.status_code in RETRY_STATUS:
+            raise RetryableStatus(r.status_code, retry_after_seconds(r))
+        if r.status_code not in (200, 206):
+            raise DownloadError(f"{season_url(year)} returned HTTP {r.status_code}")
+
+        if r.status_code == 200:
+            # Server ignored the range or the file changed, start over
+            have = 0
+            write_validator(year, r.headers.get("ETag") or r.headers.get("Last-Modified"))
+
+        expected = r.headers.get("Content-Length")
+        written = 0
+        with open(part, "ab" if have else "wb") as f:
+            for chunk in r.iter_content(CHUNK_BYTES):
+                f.write(chunk)
+                written += len(chunk)
+
+        if expected is not None and written < int(expected):
+            raise requests.ConnectionError(
+                f"{season_url(year)}: connection closed after {written} of {expected} bytes"
+            )
+
+# --------------------
+# One season
+# --------------------
+def download_season(year, session=None, max_attempts=MAX_ATTEMPTS):
+    if os.path.exists(raw_path(year)):
+        return raw_path(year)
+
+    os.makedirs(RAW_DIR, exist_ok=True)
+    session = session or requests.Session()
+
+    for attempt in range(max_attempts):
+        try:
+            fetch_remaining(year, session)
+            os.replace(part_path(year), raw_path(year))
+            if os.path.exists(validator_path(year)):
+                os.remove(validator_path(year))
+            return raw_path(year)
+        except requests.RequestException as e:
+            if attempt == max_attempts - 1:
+                raise DownloadError(f"{season_url(year)}: gave up after {max_attempts} attempts ({e})")
+            delay = backoff_delay(attempt, getattr(e, "retry_after", None))
+            print(f"Retrying {year} in {delay:.1f}s ({e})")
+            time.sleep(delay)
+
+# --------------------
+# Many seasons
+# --------------------
+# Returns (paths, failures): {year: raw file} for the seasons that arrived and
+# {year: error message} for the ones that did not.
+def download_seasons(years, max_in_flight=MAX_IN_FLIGHT):
+    years = list(years)
+    paths, failures = {}, {}
+    if not years:
+        return paths, failures
+
+    # One connection pool shared by every download
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=max_in_flight, pool_maxsize=max_in_flight)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        futures = {pool.submit(download_season, year, session): year for year in years}
+        for future in as_completed(futures):
+            year = futures[future]
+            try:
+                paths[year] = future.result()
+            except Exception as e:
+                failures[year] = str(e)
+    return paths, failures
+
+# --------------------
+# nfl_data_py-compatible entry point
+# --------------------
+# Reads downloaded season files (downloading any that are missing) the way
+# nfl_data_py does: requested columns only, float64 downcast to float32.
+def import_pbp_data(years, columns=None, include_participation=False, downcast=True, **kwargs):
+    if not isinstance(years, (list, range)):
+        raise ValueError("Input must be list or range.")
+
+    frames = []
+    for year in years:
+        path = download_season(year)
+        if columns:
+            available = pq.read_schema(path).names
+            wanted = [c for c in dict.fromkeys(list(columns) + ["season"]) if c in available]
+            frames.append(pd.read_parquet(path, columns=wanted))
+        else:
+            frames.append(pd.read_parquet(path))
+    pbp = pd.concat(frames, ignore_index=True)
+
+    if downcast:
+        cols = pbp.select_dtypes(include=[np.float64]).columns
+        pbp[cols] = pbp[cols].astype(np.float32)
+    return pbp
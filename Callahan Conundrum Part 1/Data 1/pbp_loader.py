@@ -0,0 +1,43 @@
+#pbp_loader.py
+
+#Run a per-season job across many seasons on a process pool
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def default_workers():
+    return int(os.environ.get("PBP_WORKERS", os.cpu_count() or 1))
+
+
+# --------------------
+# Season runner
+# --------------------
+# process_season(year) must be a module-level function so it can be pickled.
+# It returns a result for the season, or None when the season has nothing to
+# report. Exceptions are reported as FAILED and the season is skipped, the
+# other workers keep going.
+def run_seasons(years, process_season, workers=None):
+    years = list(years)
+    if not years:
+        return []
+    workers = workers or default_workers()
+    results = {}
+
+    if workers <= 1:
+        for year in years:
+            try:
+                results[year] = process_season(year)
+            except Exception as e:
+                print(f"FAILED {year}: {e}")
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(years))) as pool:
+            futures = {pool.submit(process_season, year): year for year in years}
+            for future in as_completed(futures):
+                year = futures[future]
+                try:
+                    results[year] = future.result()
+                except Exception as e:
+                    print(f"FAILED {year}: {e}")
+
+    # Merge in the order the seasons were requested, not completion order
+    return [(year, results[year]) for year in years if results.get(year) is not None]
@@ -0,0 +1,154 @@
+#pbp_query.py
+
+#Filtered reads from the play-by-play cache.
+#Seasons select partition files. Team, down, quarter and situation filters
+#are checked against each row group's min/max statistics, so only row groups
+#that can match are read. The same filters are then applied to those rows.
+#
+#   query_pbp([2023, 2024], columns=["game_id", "posteam", "defteam", "epa"], team="TEN")
+#   query_pbp(range(2018, 2025), team="TEN", side="off", situation="neutral")
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from pbp_cache import ensure_partition, normalize_columns, partition_path, EMPTY
+from pbp_schema import apply_schema
+
+# --------------------
+# Predicates
+# --------------------
+# A query is a list of clauses that must all hold. A clause is a list of
+# conditions of which at least one must hold:
+#   ("in", column, values)        column is one of values
+#   ("between", column, lo, hi)   lo <= column <= hi (None for open ends)
+# Missing values never match, the same as the masks in team_metrics.py.
+def team_clause(team, side):
+    if side == "off":
+        return [("in", "posteam", [team])]
+    if side == "def":
+        return [("in", "defteam", [team])]
+    if side == "any":
+        return [("in", "posteam", [team]), ("in", "defteam", [team])]
+    raise ValueError(f"side must be 'off', 'def' or 'any', not {side!r}")
+
+# Same conditions as team_metrics.FILTERS
+SITUATIONS = {
+    "early_down": [
+        [("in", "down", [1, 2])],
+    ],
+    "neutral": [
+        [("in", "down", [1, 2])],
+        [("between", "ydstogo", None, 10)],
+        [("between", "qtr", None, 3)],
+        [("between", "score_differential", -10, 10)],
+        [("in", "play_type", ["run", "pass"])],
+    ],
+}
+
+def as_list(values):
+    if values is None or isinstance(values, (list, tuple, range, set)):
+        return values
+    return [values]
+
+def build_clauses(team=None, side="any", downs=None, quarters=None, situation=None):
+    clauses = []
+    if team is not None:
+        clauses.append(team_clause(team, side))
+    if downs is not None:
+        clauses.append([("in", "down", list(as_list(downs)))])
+    if quarters is not None:
+        clauses.append([("in", "qtr", list(as_list(quarters)))])
+    if situation is not None:
+        clauses.extend(SITUATIONS[situation])
+    return clauses
+
+def clause_columns(clauses):
+    return list(dict.fromkeys(cond[1] for clause in clauses for cond in clause))
+
+# --------------------
+# Row-group pruning
+# --------------------
+def column_stats(row_group, names):
+    stats = {}
+    for i, name in enumerate(names):
+        s = row_group.column(i).statistics
+        if s is not None and s.has_min_max:
+            stats[name] = (s.min, s.max)
+    return stats
+
+def condition_may_match(cond, stats):
+    if cond[1] not in stats:
+        return True  # no statistics, has to be read
+    lo, hi = stats[cond[1]]
+    if cond[0] == "in":
+        return any(lo <= v <= hi for v in cond[2])
+    want_lo, want_hi = cond[2], cond[3]
+    return (want_lo is None or hi >= want_lo) and (want_hi is None or lo <= want_hi)
+
+def matching_row_groups(path, clauses):
+    meta = pq.ParquetFile(path).metadata
+    names = [meta.schema.column(i).path for i in range(meta.num_columns)]
+    keep = []
+    for i in range(meta.num_row_groups):
+        stats = column_stats(meta.row_group(i), names)
+        if all(any(condition_may_match(c, stats) for c in clause) for clause in clauses):
+            keep.append(i)
+    return keep
+
+# --------------------
+# Row filtering
+# --------------------
+def condition_mask(df, cond):
+    col = df[cond[1]]
+    if cond[0] == "in":
+        mask = col.isin(cond[2])
+    else:
+        mask = pd.Series(True, index=df.index)
+        if cond[2] is not None:
+            mask &= col >= cond[2]
+        if cond[3] is not None:
+            mask &= col <= cond[3]
+    return mask.fillna(False).astype(bool)
+
+def clauses_mask(df, clauses):
+    mask = np.ones(len(df), dtype=bool)
+    for clause in clauses:
+        either = np.zeros(len(df), dtype=bool)
+        for cond in clause:
+            either |= condition_mask(df, cond).to_numpy()
+        mask &= either
+    return mask
+
+# --------------------
+# Query
+# --------------------
+# Returns the requested columns for every play in the seasons that matches
+# all the filters. side picks which team column the team filter applies to:
+# "off" (posteam), "def" (defteam) or "any" (either).
+def query_pbp(seasons, columns=None, team=None, side="any", downs=None, quarters=None,
+              situation=None, refresh=False):
+    if isinstance(seasons, int):
+        seasons = [seasons]
+    clauses = build_clauses(team, side, downs, quarters, situation)
+
+    columns = normalize_columns(columns)
+    read_columns = None if columns is None else list(dict.fromkeys(columns + clause_columns(clauses)))
+
+    frames = []
+    for year in seasons:
+        if ensure_partition(year, columns=read_columns, refresh=refresh) is EMPTY:
+            continue
+        path = partition_path(year)
+
+        groups = matching_row_groups(path, clauses)
+        if not groups:
+            continue
+
+        pbp = apply_schema(pq.ParquetFile(path).read_row_groups(groups, columns=read_columns).to_pandas())
+        frames.append(pbp[clauses_mask(pbp, clauses)])
+
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    pbp = pd.concat(frames, ignore_index=True)
+    return pbp if columns is None else pbp[columns]
@@ -0,0 +1,97 @@
+#pbp_schema.py
+
+#Compact dtypes for the play-by-play fields the project uses
+import numpy as np
+import pandas as pd
+
+# --------------------
+# Category vocabularies
+# --------------------
+# Every nflverse team abbreviation since 1999, including relocated franchises
+TEAM_CODES = [
+    "ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE", "DAL", "DEN",
+    "DET", "GB", "HOU", "IND", "JAX", "KC", "LA", "LAC", "LV", "MIA",
+    "MIN", "NE", "NO", "NYG", "NYJ", "OAK", "PHI", "PIT", "SD", "SEA",
+    "SF", "STL", "TB", "TEN", "WAS",
+]
+
+PLAY_TYPES = [
+    "extra_point", "field_goal", "kickoff", "no_play", "pass", "punt",
+    "qb_kneel", "qb_spike", "run",
+]
+
+# --------------------
+# Schema
+# --------------------
+# Nullable integer types because down, distance and yardage are missing on
+# kickoffs, timeouts and end-of-quarter rows.
+SCHEMA_VERSION = 1
+
+SCHEMA = {
+    "season": "int16",
+    "posteam": pd.CategoricalDtype(TEAM_CODES),
+    "defteam": pd.CategoricalDtype(TEAM_CODES),
+    "play_type": pd.CategoricalDtype(PLAY_TYPES),
+    "down": "Int8",
+    "qtr": "Int8",
+    "ydstogo": "Int16",
+    "yards_gained": "Int16",
+    "score_differential": "Int16",
+    "touchdown": "Int8",
+    "pass": "Int8",
+    "epa": "float32",
+    "game_id": "category",
+}
+
+# --------------------
+# Packed game key
+# --------------------
+# nflverse game ids look like "2023_01_TEN_NO" (season, week, away, home).
+# A team plays at most once a week, so season, week and home team identify
+# the game: season * 100000 + week * 1000 + home team index, as int32.
+def game_key(game_id):
+    ids = game_id.astype("category")
+    parts = ids.cat.categories.to_series().str.split("_", expand=True)
+
+    home = parts[3].map({t: i for i, t in enumerate(TEAM_CODES)})
+    keys = parts[0].astype(np.int32) * 100000 + parts[1].astype(np.int32) * 1000 + home
+
+    codes = ids.cat.codes.to_numpy()
+    packed = pd.array(keys.to_numpy(dtype=np.float64)[codes], dtype="Int32")
+    packed[codes == -1] = pd.NA
+    return pd.Series(packed, index=game_id.index, name="game_key")
+
+def unpack_game_key(key):
+    key = int(key)
+    return key // 100000, key // 1000 % 100, TEAM_CODES[key % 1000]
+
+# --------------------
+# Apply
+# --------------------
+def with_known_categories(series, dtype):
+    if series.dtype == dtype:
+        return series
+
+    # Never drop a value the vocabulary does not know about, append it instead
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        values = series.cat.categories
+    else:
+        values = series.dropna().unique()
+    extra = sorted(set(map(str, values)) - set(dtype.categories))
+    if extra:
+        dtype = pd.CategoricalDtype(list(dtype.categories) + extra)
+    return series.astype(dtype)
+
+def apply_schema(pbp):
+    pbp = pbp.copy(deep=False)
+    for col, dtype in SCHEMA.items():
+        if col not in pbp.columns:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype) and dtype.categories is not None:
+            pbp[col] = with_known_categories(pbp[col], dtype)
+        else:
+            pbp[col] = pbp[col].astype(dtype)
+
+    if "game_id" in pbp.columns and "game_key" not in pbp.columns:
+        pbp["game_key"] = game_key(pbp["game_id"])
+    return pbp
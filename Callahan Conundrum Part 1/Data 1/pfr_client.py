@@ -0,0 +1,257 @@
+#pfr_client.py
+
+#Rate-limited asyncio client for Pro-Football-Reference pages.
+#All requests share one requests.Session connection pool. A token bucket
+#keeps the request rate under the site's crawl limit (20 requests a minute)
+#and a semaphore caps how many requests are open at once. Pages are fetched
+#as soon as a token is free, so a refresh takes as long as the rate limit
+#and no longer.
+#Responses are cached on disk with their ETag / Last-Modified and revalidated
+#with conditional GETs, so an unchanged page comes back as a bodiless 304.
+#429s wait for Retry-After; 5xx responses and dropped connections back off
+#and retry.
+#PFR_OFFLINE=1 serves from that cache only and never touches the network.
+import os
+import json
+import time
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+
+# --------------------
+# Config
+# --------------------
+PFR_BASE_URL = os.environ.get("PFR_BASE_URL", "https://www.pro-football-reference.com")
+
+# Sports Reference blocks clients making more than 20 requests in a minute
+REQUESTS_PER_MINUTE = float(os.environ.get("PFR_REQUESTS_PER_MINUTE", 20))
+BURST = 1
+MAX_CONCURRENCY = 4
+
+TIMEOUT_S = (10, 60)  # connect, read
+MAX_ATTEMPTS = 4
+RETRY_STATUSES = (500, 502, 503, 504)
+BACKOFF_S = 2
+USER_AGENT = "callahan-conundrum/0.1 (team history research)"
+
+PFR_CACHE_DIR = os.environ.get("PFR_CACHE_DIR", "pfr_cache")
+PFR_OFFLINE = os.environ.get("PFR_OFFLINE") == "1"
+
+class CacheMiss(Exception):
+    pass
+
+# --------------------
+# Response cache
+# --------------------
+# One body file and one metadata file per URL, named by the URL's hash
+class ResponseCache:
+    def __init__(self, directory=PFR_CACHE_DIR):
+        self.directory = directory
+
+    def paths(self, url):
+        key = hashlib.sha256(url.encode()).hexdigest()[:32]
+        base = os.path.join(self.directory, key)
+        return base + ".body", base + ".json"
+
+    def load(self, url):
+        body_path, meta_path = self.paths(url)
+        meta = self.load_meta(url)
+        if meta is None or not os.path.exists(body_path):
+            return None, None
+        try:
+            with open(body_path, "rb") as f:
+                return f.read(), meta
+        except FileNotFoundError:
+            return None, None
+
+    def load_meta(self, url):
+        _, meta_path = self.paths(url)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            return json.load(f)
+
+    # Conditional GET headers from the metadata alone; the body is not read
+    def validators(self, url):
+        body_path, _ = self.paths(url)
+        meta = self.load_meta(url) if os.path.exists(body_path) else None
+        headers = {}
+        if meta and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta and meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def store(self, url, response):
+        os.makedirs(self.directory, exist_ok=True)
+        body_path, meta_path = self.paths(url)
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_type": response.headers.get("Content-Type"),
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+        }
+        # Body first, metadata last, so a crash never leaves validators for a
+        # body that was not written
+        for path, data, mode in ((body_path, response.content, "wb"), (meta_path, json.dumps(meta, indent=2), "w")):
+            tmp = path + ".tmp"
+            with open(tmp, mode) as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+def decode(body, content_type):
+    # The site serves UTF-8; don't fall back to Latin-1 when a server leaves
+    # the charset out
+    charset = "utf-8"
+    if content_type and "charset=" in content_type:
+        charset = content_type.split("charset=")[-1].split(";")[0].strip()
+    return body.decode(charset, errors="replace")
+
+# --------------------
+# Retry-After
+# --------------------
+# Seconds to wait, from either form the header may take (RFC 9110): a number
+# of seconds or an HTTP-date. Missing or unreadable values give default.
+def retry_after_seconds(response, default):
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+# --------------------
+# Token bucket
+# --------------------
+# Tokens refill continuously at rate per second up to capacity. acquire()
+# waits until one is available. With capacity 1 no 60-second window sees
+# more than about REQUESTS_PER_MINUTE requests.
+class TokenBucket:
+    def __init__(self, rate, capacity=BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        async with self.lock:
+            self.refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self.refill()
+            self.tokens -= 1
+
+# --------------------
+# Client
+# --------------------
+class PFRClient:
+    def __init__(self, base_url=PFR_BASE_URL, requests_per_minute=REQUESTS_PER_MINUTE,
+                 concurrency=MAX_CONCURRENCY, cache_dir=PFR_CACHE_DIR, offline=PFR_OFFLINE):
+        self.base_url = base_url.rstrip("/")
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.offline = offline
+        self.stats = {"downloaded": 0, "not_modified": 0, "offline": 0, "bytes": 0}
+        self.bucket = TokenBucket(requests_per_minute / 60)
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def url(self, path):
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    # requests is blocking, so each call runs on a worker thread; the pool
+    # and the rate limit are still shared by every coroutine
+    async def get(self, path, headers=None):
+        async with self.semaphore:
+            for attempt in range(MAX_ATTEMPTS):
+                last = attempt == MAX_ATTEMPTS - 1
+                await self.bucket.acquire()
+                try:
+                    response = await asyncio.to_thread(
+                        self.session.get, self.url(path), headers=headers, timeout=TIMEOUT_S
+                    )
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if last:
+                        raise
+                    print(f"{type(e).__name__} on {path}, retrying")
+                    await asyncio.sleep(BACKOFF_S * 2 ** attempt)
+                    continue
+
+                # Told to slow down: wait as long as asked, then try again
+                if response.status_code == 429 and not last:
+                    wait = retry_after_seconds(response, 60)
+                    print(f"Rate limited on {path}, waiting {wait:.0f}s")
+                    await asyncio.sleep(wait)
+                    continue
+
+                # Server trouble: back off (or wait as asked) and try again
+                if response.status_code in RETRY_STATUSES and not last:
+                    wait = retry_after_seconds(response, BACKOFF_S * 2 ** attempt)
+                    print(f"HTTP {response.status_code} on {path}, retrying in {wait:.0f}s")
+                    await asyncio.sleep(wait)
+                    continue
+
+                response.raise_for_status()
+                return response
+
+    async def get_text(self, path):
+        url = self.url(path)
+        if self.cache is None:
+            response = await self.get(path)
+            return decode(response.content, response.headers.get("Content-Type"))
+
+        if self.offline:
+            body, meta = self.cache.load(url)
+            if body is None:
+                raise CacheMiss(f"{url} is not cached and PFR_OFFLINE is set")
+            self.stats["offline"] += 1
+            return decode(body, meta.get("content_type"))
+
+        response = await self.get(path, headers=self.cache.validators(url))
+        if response.status_code == 304:
+            body, meta = self.cache.load(url)
+            if body is not None:
+                self.stats["not_modified"] += 1
+                return decode(body, meta.get("content_type"))
+            # The cached copy went missing since the request was made
+            print(f"Cached body for {path} is gone, fetching it again")
+            response = await self.get(path)
+
+        self.cache.store(url, response)
+        self.stats["downloaded"] += 1
+        self.stats["bytes"] += len(response.content)
+        return decode(response.content, response.headers.get("Content-Type"))
+
+    def close(self):
+        self.session.close()
+
+# --------------------
+# Many pages
+# --------------------
+# Returns {path: html} for every path, fetched concurrently through one client
+async def fetch_pages(paths, client=None):
+    client = client or PFRClient()
+    texts = await asyncio.gather(*(client.get_text(p) for p in paths))
+    return dict(zip(paths, texts))
@@ -0,0 +1,195 @@
+#pfr_standin.py
+
+#Local HTTP stand-in for Pro-Football-Reference team pages.
+#record captures the /teams/ index and every /teams/{code}/ page to disk
+#(from the site, or from the scraper's response cache). serve replays them
+#with ETag / Last-Modified support and can be slow, fail, or rate-limit on
+#purpose, so team_years.py can be run and timed with no network access.
+#
+#   python pfr_standin.py record recorded_pfr/
+#   python pfr_standin.py record recorded_pfr/ --from-cache pfr_cache
+#   python pfr_standin.py serve recorded_pfr/ --latency 0.2 --error-rate 0.1 --limit-per-minute 20
+#   PFR_BASE_URL=http://127.0.0.1:8766 python team_years.py
+import os
+import sys
+import json
+import glob
+import asyncio
+import argparse
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import standin_http
+from standin_http import StandinHandler
+
+# --------------------
+# Config
+# --------------------
+DEFAULT_PORT = 8766
+DEFAULT_DIR = "recorded_pfr"
+INDEX_PATH = "/teams/"
+
+# --------------------
+# Recorded pages
+# --------------------
+# A URL path maps to {directory}{path}index.html, the way a static mirror
+# lays it out: /teams/ -> teams/index.html, /teams/oti/ -> teams/oti/index.html
+def page_file(directory, path):
+    parts = [p for p in urlsplit(path).path.split("/") if p]
+    if any(p in (".", "..") for p in parts):
+        return None
+    return os.path.join(directory, *parts, "index.html")
+
+def write_page(directory, path, html):
+    file = page_file(directory, path)
+    os.makedirs(os.path.dirname(file), exist_ok=True)
+    with open(file, "w", encoding="utf-8") as f:
+        f.write(html)
+
+# Fetches the index and every team page through the rate-limited client
+def record_pages(directory, client=None):
+    from pfr_client import PFRClient, fetch_pages
+    from team_years import team_codes_from_index
+
+    async def fetch():
+        pfr = client or PFRClient()
+        try:
+            index = await pfr.get_text(INDEX_PATH)
+            paths = [f"/teams/{team}/" for team in team_codes_from_index(index)]
+            return {INDEX_PATH: index, **await fetch_pages(paths, pfr)}
+        finally:
+            pfr.close()
+
+    pages = asyncio.run(fetch())
+    for path, html in pages.items():
+        write_page(directory, path, html)
+    print(f"Recorded {len(pages)} pages to {directory}")
+    return list(pages)
+
+# Copies team pages already in the response cache, without any requests
+def record_from_cache(directory, cache_dir):
+    from pfr_client import decode
+
+    recorded = []
+    for meta_path in sorted(glob.glob(os.path.join(cache_dir, "*.json"))):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        path = urlsplit(meta["url"]).path
+        if not path.startswith(INDEX_PATH):
+            continue
+        with open(meta_path[:-len(".json")] + ".body", "rb") as f:
+            write_page(directory, path, decode(f.read(), meta.get("content_type")))
+        recorded.append(path)
+    print(f"Recorded {len(recorded)} pages from {cache_dir} to {directory}")
+    return recorded
+
+# --------------------
+# Request handler
+# --------------------
+class PFRHandler(StandinHandler):
+    log_name = "pfr-standin"
+    directory = DEFAULT_DIR
+
+    def serve(self, body):
+        if self.answered_with_failure():
+            return
+
+        file = page_file(self.directory, self.path)
+        if file is None or not os.path.isfile(file):
+            self.send_not_found()
+            return
+
+        stat = os.stat(file)
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        last_modified = formatdate(stat.st_mtime, usegmt=True)
+
+        if self.not_modified(etag, stat.st_mtime):
+            self.send_empty(304, (("ETag", etag), ("Last-Modified", last_modified)))
+            return
+
+        with open(file, "rb") as f:
+            content = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.end_headers()
+        self.count(200)
+        if body:
+            self.wfile.write(content)
+
+    # If-None-Match wins over If-Modified-Since when both are sent
+    def not_modified(self, etag, mtime):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(",")]
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+# --------------------
+# Server
+# --------------------
+# behavior: latency, jitter, error_rate, throttle_rate, limit_per_minute,
+# retry_after (see standin_http.StandinHandler)
+def make_server(directory=DEFAULT_DIR, port=DEFAULT_PORT, host="127.0.0.1", **behavior):
+    return standin_http.make_server(PFRHandler, port, host, directory=directory, **behavior)
+
+def start_in_background(directory=DEFAULT_DIR, port=0, **behavior):
+    return standin_http.serve_in_background(make_server(directory, port=port, **behavior))
+
+# --------------------
+# MAIN
+# --------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record and replay Pro-Football-Reference team pages")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="capture /teams/ and every team page")
+    record.add_argument("directory", nargs="?", default=DEFAULT_DIR)
+    record.add_argument("--from-cache", metavar="CACHE_DIR", help="copy pages from the response cache instead")
+
+    serve = commands.add_parser("serve", help="replay recorded pages")
+    serve.add_argument("directory", nargs="?", default=DEFAULT_DIR)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    serve.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds, at random")
+    serve.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    serve.add_argument("--throttle-rate", type=float, default=0.0, help="share of requests answered with 429")
+    serve.add_argument("--limit-per-minute", type=int, default=0, help="answer 429 above this many requests a minute")
+    serve.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on 429 and 503")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        if args.from_cache:
+            record_from_cache(args.directory, args.from_cache)
+        else:
+            record_pages(args.directory)
+        return 0
+
+    if not os.path.isfile(page_file(args.directory, INDEX_PATH)):
+        print(f"No recorded index under {args.directory}; run record first")
+        return 1
+
+    server = make_server(
+        args.directory, args.port,
+        latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        limit_per_minute=args.limit_per_minute, retry_after=args.retry_after,
+    )
+    print(f"Serving {args.directory} at http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Responses: {dict(sorted(server.statuses.items()))}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#pfr_tables.py
+
+#Pulls one table out of a Pro-Football-Reference page by its id.
+#This replaces pd.read_html, which parses every table on the page and then
+#infers the types. lxml parses the page once with the plain etree parser
+#(no lxml.html element classes), an XPath lookup finds the table, and each
+#row's cells go straight into per-column lists. Integer
+#columns become int64 and other numeric columns float64. Text stays text,
+#with empty cells as missing.
+import re
+
+import numpy as np
+import pandas as pd
+from lxml import etree
+
+HTML_PARSER = etree.HTMLParser()
+
+def parse_html(page):
+    return etree.fromstring(page, HTML_PARSER)
+
+# --------------------
+# Locate the table
+# --------------------
+# Some tables are shipped inside an HTML comment and only shown by script,
+# so a comment holding the id is searched when the table is not in the DOM
+def find_table(root, table_id):
+    tables = root.xpath(f'//table[@id="{table_id}"]')
+    if tables:
+        return tables[0]
+
+    for comment in root.xpath("//comment()"):
+        if f'id="{table_id}"' in (comment.text or ""):
+            tables = parse_html(comment.text).xpath(f'//table[@id="{table_id}"]')
+            if tables:
+                return tables[0]
+    return None
+
+# Most cells are plain text or a single link, so the text is read directly
+# and only nested cells walk their children
+def cell_text(cell):
+    if len(cell) == 0:
+        return (cell.text or "").strip()
+    return "".join(cell.itertext()).strip()
+
+def is_cell(element):
+    return element.tag in ("th", "td")
+
+def span(cell):
+    try:
+        return max(int(cell.get("colspan", 1)), 1)
+    except ValueError:
+        return 1
+
+# A cell spanning n columns fills all n with its text, as pd.read_html does
+def cell_values(row):
+    values = []
+    for cell in row:
+        if is_cell(cell):
+            values.extend([cell_text(cell)] * span(cell))
+    return values
+
+# --------------------
+# Header
+# --------------------
+# The last header row holds the column names (the one above it groups them).
+# Repeated names get .1, .2 ... the way pandas numbers them.
+def header_names(table):
+    rows = table.xpath("./thead/tr")
+    names = [" ".join(v.split()) for v in cell_values(rows[-1])]
+
+    seen = {}
+    unique = []
+    for name in names:
+        if name in seen:
+            seen[name] += 1
+            unique.append(f"{name}.{seen[name]}")
+        else:
+            seen[name] = 0
+            unique.append(name)
+    return unique
+
+# --------------------
+# Typed columns
+# --------------------
+INT_RE = re.compile(r"^[+-]?\d+$")
+FLOAT_RE = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)$")
+
+def typed_column(values):
+    present = [v for v in values if v != ""]
+    if present and len(present) == len(values) and all(INT_RE.match(v) for v in present):
+        return np.array(values, dtype=np.int64)
+    if present and all(FLOAT_RE.match(v) for v in present):
+        return np.array([float(v) if v != "" else np.nan for v in values], dtype=np.float64)
+    return np.array([v if v != "" else np.nan for v in values], dtype=object)
+
+# --------------------
+# Extract
+# --------------------
+# Rows whose key cell is not a number (repeated header rows, totals) are
+# skipped, which is what the old isnumeric() filter on Year did. Rows that
+# still don't line up with the header after colspans are expanded are
+# skipped too, and counted in df.attrs["skipped_rows"].
+def extract_table(page, table_id, key="Year"):
+    root = parse_html(page)
+    table = find_table(root, table_id)
+    if table is None:
+        raise ValueError(f"No table with id {table_id!r} on the page")
+
+    names = header_names(table)
+    key_idx = names.index(key)
+    columns = [[] for _ in names]
+    skipped = 0
+
+    for row in table.iterfind("./tbody/tr"):
+        values = [cell_text(c) for c in row]
+        if len(values) != len(names):
+            # Only rows with colspans, comments or other stray nodes pay for this
+            values = cell_values(row)
+            if len(values) != len(names):
+                skipped += 1
+                continue
+        if not values[key_idx].isnumeric():
+            continue
+        for col, value in zip(columns, values):
+            col.append(value)
+
+    if skipped:
+        print(f"{table_id}: skipped {skipped} rows that do not match the {len(names)} header columns")
+    df = pd.DataFrame({name: typed_column(col) for name, col in zip(names, columns)})
+    df.attrs["skipped_rows"] = skipped
+    return df
@@ -0,0 +1,113 @@
+#pipeline_trace.py
+
+#Per-stage timing and memory records for the data pipeline.
+#Each stage records wall time, CPU time, peak RSS and row counts, tagged
+#with the season and team it ran for. Records can be written as a JSON
+#list or as a Chrome trace (open in chrome://tracing or ui.perfetto.dev).
+import os
+import sys
+import json
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Records for the current process. Worker processes hand theirs back with
+# their results (see drain_events) and the parent merges them.
+EVENTS = []
+
+# --------------------
+# Memory
+# --------------------
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+# --------------------
+# Stage recorder
+# --------------------
+# with stage("aggregate", season=2024) as rec:
+#     df = ...
+#     rec["rows"] = len(df)
+@contextmanager
+def stage(name, season=None, team=None, **fields):
+    record = {"stage": name, "season": season, "team": team, "rows": None}
+    record.update(fields)
+
+    rss_before = peak_rss_mb()
+    start_ts = time.time()
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        yield record
+    finally:
+        record["wall_s"] = time.perf_counter() - start_wall
+        record["cpu_s"] = time.process_time() - start_cpu
+        record["start_ts"] = start_ts
+        record["pid"] = os.getpid()
+        record["peak_rss_mb"] = peak_rss_mb()
+        # How far this stage pushed the process high-water mark
+        if rss_before is not None:
+            record["rss_growth_mb"] = record["peak_rss_mb"] - rss_before
+        EVENTS.append(record)
+
+def drain_events():
+    events = list(EVENTS)
+    EVENTS.clear()
+    return events
+
+def add_events(events):
+    EVENTS.extend(events)
+
+# --------------------
+# Output
+# --------------------
+def write_json_trace(path, events=None):
+    events = EVENTS if events is None else events
+    with open(path, "w") as f:
+        json.dump(sorted(events, key=lambda e: e["start_ts"]), f, indent=2)
+
+def write_chrome_trace(path, events=None):
+    events = EVENTS if events is None else events
+    origin = min((e["start_ts"] for e in events), default=0)
+
+    trace = []
+    for e in events:
+        label = e["stage"] if e["team"] is None else f"{e['stage']} ({e['team']})"
+        trace.append({
+            "name": label,
+            "cat": "pipeline",
+            "ph": "X",
+            "ts": (e["start_ts"] - origin) * 1e6,
+            "dur": e["wall_s"] * 1e6,
+            "pid": e["pid"],
+            # One row per season in the viewer
+            "tid": e["season"] if e["season"] is not None else 0,
+            "args": {k: v for k, v in e.items() if k not in ("stage", "start_ts", "pid")},
+        })
+
+    with open(path, "w") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+# Paths ending in .chrome.json get the Chrome format, anything else the plain list
+def write_trace(path, events=None):
+    if path.endswith(".chrome.json"):
+        write_chrome_trace(path, events)
+    else:
+        write_json_trace(path, events)
+
+def summary(events=None):
+    events = EVENTS if events is None else events
+    totals = {}
+    for e in events:
+        t = totals.setdefault(e["stage"], {"wall_s": 0.0, "cpu_s": 0.0, "calls": 0})
+        t["wall_s"] += e["wall_s"]
+        t["cpu_s"] += e["cpu_s"]
+        t["calls"] += 1
+    return totals
@@ -0,0 +1,63 @@
+#season_store.py
+
+#Keyed CSV tables with upsert semantics, so re-runs replace rows instead of appending
+import os
+
+import pandas as pd
+
+from arrow_store import publish
+
+# --------------------
+# Read / write
+# --------------------
+def read_store(path):
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    return pd.read_csv(path)
+
+# Every write also stores the memory-mappable Arrow copy, parsed back from the
+# CSV so it matches pd.read_csv (see arrow_store.py)
+def write_store(df, path):
+    tmp = path + ".tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+    publish(path)
+
+# --------------------
+# Upsert
+# --------------------
+# Rows in new_rows replace any stored rows with the same key, everything
+# else is kept. Running the same refresh twice leaves the file unchanged.
+# Rows are sorted by the keys unless order(merged) returns another ordering.
+def upsert(path, new_rows, keys, order=None):
+    stored = read_store(path)
+
+    if stored.empty:
+        merged = new_rows
+    else:
+        new_keys = pd.MultiIndex.from_frame(new_rows[keys].astype(stored[keys].dtypes.to_dict()))
+        keep = ~pd.MultiIndex.from_frame(stored[keys]).isin(new_keys)
+        merged = pd.concat([stored[keep], new_rows], ignore_index=True)
+
+    if order is None:
+        merged = merged.sort_values(keys)
+    else:
+        merged = order(merged)
+    merged = merged.reset_index(drop=True)
+    write_store(merged, path)
+    return merged
+
+# --------------------
+# What needs computing
+# --------------------
+# A season is missing when the store has no rows for it. Seasons listed in
+# stale (the in-progress one, manual corrections) are always recomputed.
+def stored_seasons(path, season_col="season"):
+    stored = read_store(path)
+    if stored.empty:
+        return set()
+    return set(stored[season_col].astype(int))
+
+def seasons_to_process(path, years, stale=()):
+    done = stored_seasons(path)
+    return [y for y in years if y not in done or y in set(stale)]
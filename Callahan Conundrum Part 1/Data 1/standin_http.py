@@ -0,0 +1,112 @@
+#standin_http.py
+
+#HTTP plumbing shared by the local stand-in servers (standin_server.py for
+#nflverse season files, pfr_standin.py for Pro-Football-Reference pages).
+#The base handler adds latency and can fail on purpose: random 503s and 429s,
+#and a per-minute request limit like the real site's. It also counts every
+#status it answers with. make_server gives each server its own counters, and
+#serve_in_background runs one on a thread for scripts and tests.
+import sys
+import time
+import random
+import threading
+from collections import Counter, deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# --------------------
+# Request handler
+# --------------------
+# Subclasses implement serve(body) and call answered_with_failure() first
+class StandinHandler(BaseHTTPRequestHandler):
+    log_name = "standin"
+    latency = 0.0           # seconds added to every response
+    jitter = 0.0            # up to this many seconds more, at random
+    error_rate = 0.0        # share of requests answered with 503
+    throttle_rate = 0.0     # share of requests answered with 429
+    limit_per_minute = 0    # 429 once more than this many in 60 s (0 = no limit)
+    retry_after = 1
+
+    # Shared by every handler thread of one server (see make_server)
+    lock = None
+    recent = None
+    statuses = None
+
+    def log_message(self, fmt, *args):
+        sys.stderr.write(f"[{self.log_name}] {self.address_string()} {fmt % args}\n")
+
+    def do_HEAD(self):
+        self.serve(body=False)
+
+    def do_GET(self):
+        self.serve(body=True)
+
+    def serve(self, body):
+        raise NotImplementedError
+
+    def count(self, status):
+        with self.lock:
+            self.statuses[status] += 1
+
+    def send_empty(self, status, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        self.count(status)
+
+    def send_not_found(self):
+        self.send_error(404)
+        self.count(404)
+
+    # Sliding 60-second window, like the site's crawl limit
+    def over_limit(self):
+        if not self.limit_per_minute:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            while self.recent and now - self.recent[0] >= 60:
+                self.recent.popleft()
+            if len(self.recent) >= self.limit_per_minute:
+                return True
+            self.recent.append(now)
+            return False
+
+    # Waits out the latency, then answers 429 or 503 if this request is one
+    # that should fail. Returns True when it has answered.
+    def answered_with_failure(self):
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+
+        retry = (("Retry-After", str(self.retry_after)),)
+        if self.over_limit() or (self.throttle_rate and random.random() < self.throttle_rate):
+            self.send_empty(429, retry)
+            return True
+        if self.error_rate and random.random() < self.error_rate:
+            self.send_empty(503, retry)
+            return True
+        return False
+
+# --------------------
+# Server
+# --------------------
+# handler_attrs override the class attributes above (latency, error_rate, ...)
+# and any the subclass defines
+def make_server(handler_class, port, host="127.0.0.1", **handler_attrs):
+    handler = type("Handler", (handler_class,), {
+        "lock": threading.Lock(),
+        "recent": deque(),
+        "statuses": Counter(),
+        **handler_attrs,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    # {status: count} of everything answered so far
+    server.statuses = handler.statuses
+    return server
+
+# Runs the server on a background thread; returns (server, base_url).
+# Call server.shutdown() when done.
+def serve_in_background(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
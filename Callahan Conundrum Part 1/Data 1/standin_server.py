@@ -0,0 +1,160 @@
+#standin_server.py
+
+#Local HTTP stand-in for the nflverse release server.
+#Serves recorded season files (play_by_play_YYYY.parquet) from a directory,
+#with ETag and byte-range support, and can fail on purpose to exercise the
+#retry and resume paths in pbp_download.py.
+#
+#   python standin_server.py recorded/ --synthetic 2000-2005
+#   python standin_server.py recorded/ --port 8765 --fail-rate 0.2 --drop-rate 0.2 --latency 0.1
+#   PBP_BASE_URL=http://127.0.0.1:8765 python titans_metrics_1.py
+import os
+import re
+import sys
+import random
+import argparse
+
+import standin_http
+from standin_http import StandinHandler
+
+# --------------------
+# Config
+# --------------------
+DEFAULT_PORT = 8765
+CHUNK_BYTES = 1 << 16
+
+# --------------------
+# Recorded files
+# --------------------
+# Writes synthetic seasons in the nflverse file layout, for runs without network
+def record_synthetic(directory, years):
+    import synthetic_pbp
+
+    os.makedirs(directory, exist_ok=True)
+    for year in years:
+        pbp = synthetic_pbp.import_pbp_data([year], downcast=False)
+        pbp.to_parquet(os.path.join(directory, f"play_by_play_{year}.parquet"), index=False)
+        print(f"Recorded {year}: {len(pbp)} plays")
+
+def parse_years(text):
+    if "-" in text:
+        first, last = text.split("-")
+        return list(range(int(first), int(last) + 1))
+    return [int(y) for y in text.split(",")]
+
+# --------------------
+# Request handler
+# --------------------
+RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+def parse_range(header, size):
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+class SeasonFileHandler(StandinHandler):
+    directory = "."
+    drop_rate = 0.0         # share of bodies cut off early
+
+    def serve(self, body):
+        # Only the file name matters, so any release prefix in the URL works
+        name = os.path.basename(self.path.split("?")[0])
+        path = os.path.join(self.directory, name)
+        if not name or not os.path.isfile(path):
+            self.send_not_found()
+            return
+
+        if self.answered_with_failure():
+            return
+
+        stat = os.stat(path)
+        size = stat.st_size
+        etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+
+        start, end = 0, size - 1
+        status = 200
+        requested = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if requested and (if_range is None or if_range == etag):
+            byte_range = parse_range(requested, size)
+            if byte_range is None or byte_range[0] >= size:
+                self.send_empty(416, (("Content-Range", f"bytes */{size}"),))
+                return
+            start, end = byte_range
+            status = 206
+
+        length = end - start + 1
+        self.send_response(status)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        self.count(status)
+        if not body:
+            return
+
+        # A dropped connection cuts the body somewhere in the middle
+        cut = start + random.randrange(length) if random.random() < self.drop_rate else None
+        with open(path, "rb") as f:
+            f.seek(start)
+            sent = start
+            while sent <= end:
+                stop = end + 1 if cut is None else min(end + 1, cut)
+                if sent >= stop:
+                    break
+                chunk = f.read(min(CHUNK_BYTES, stop - sent))
+                self.wfile.write(chunk)
+                sent += len(chunk)
+        if cut is not None:
+            self.close_connection = True
+
+# --------------------
+# Server
+# --------------------
+# fail_rate is the share of requests answered with 503; any other behavior
+# (latency, throttle_rate, ...) is passed on, see standin_http.StandinHandler
+def make_server(directory, port=DEFAULT_PORT, fail_rate=0.0, drop_rate=0.0, host="127.0.0.1", **behavior):
+    return standin_http.make_server(
+        SeasonFileHandler, port, host,
+        directory=directory, error_rate=fail_rate, drop_rate=drop_rate, **behavior,
+    )
+
+def start_in_background(directory, port=0, **behavior):
+    return standin_http.serve_in_background(make_server(directory, port=port, **behavior))
+
+# --------------------
+# MAIN
+# --------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve recorded play-by-play season files")
+    parser.add_argument("directory")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--synthetic", help="record synthetic seasons first, e.g. 2000-2005")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="share of bodies cut off early")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        record_synthetic(args.directory, parse_years(args.synthetic))
+
+    server = make_server(args.directory, args.port, args.fail_rate, args.drop_rate, latency=args.latency)
+    print(f"Serving {args.directory} at http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#synthetic_pbp.py
+
+#Deterministic synthetic play-by-play for benchmarking without network access.
+#import_pbp_data() mirrors nfl_data_py's signature, so it can stand in for it
+#(set PBP_SOURCE=synthetic, see pbp_cache.py).
+import numpy as np
+import pandas as pd
+
+# --------------------
+# Config
+# --------------------
+SEED = 2024
+
+TEAMS = [
+    "ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE", "DAL", "DEN",
+    "DET", "GB", "HOU", "IND", "JAX", "KC", "LA", "LAC", "LV", "MIA",
+    "MIN", "NE", "NO", "NYG", "NYJ", "PHI", "PIT", "SEA", "SF", "TB",
+    "TEN", "WAS",
+]
+
+PLAYS_PER_GAME = 175
+PLAYS_PER_DRIVE = 6
+
+# --------------------
+# Schedule
+# --------------------
+# Every team plays every week; pairings are reshuffled each week.
+def season_weeks(season):
+    return 18 if season >= 2021 else 17
+
+def schedule(season, rng, teams=TEAMS):
+    games = []
+    for week in range(1, season_weeks(season) + 1):
+        order = rng.permutation(len(teams))
+        for away, home in order.reshape(-1, 2):
+            games.append((week, teams[away], teams[home]))
+    return pd.DataFrame(games, columns=["week", "away_team", "home_team"])
+
+# --------------------
+# One season
+# --------------------
+def synthetic_season(season, seed=SEED, teams=TEAMS):
+    rng = np.random.default_rng([seed, season])
+    games = schedule(season, rng, teams)
+    n_games = len(games)
+
+    # Plays per game vary a little around the league average
+    per_game = rng.integers(PLAYS_PER_GAME - 25, PLAYS_PER_GAME + 25, n_games)
+    game_idx = np.repeat(np.arange(n_games), per_game)
+    n = len(game_idx)
+
+    starts = np.repeat(np.cumsum(per_game) - per_game, per_game)
+    play_in_game = np.arange(n) - starts
+    progress = play_in_game / np.repeat(per_game, per_game)
+
+    # Possession flips at the end of every drive
+    drive_len = rng.geometric(1 / PLAYS_PER_DRIVE, n)
+    new_drive = np.zeros(n, dtype=bool)
+    new_drive[0] = True
+    new_drive[np.minimum(np.cumsum(drive_len), n - 1)] = True
+    new_drive[starts == np.arange(n)] = True
+    drive = np.cumsum(new_drive)
+    drive_in_game = drive - np.repeat(drive[np.cumsum(per_game) - per_game], per_game)
+    drive_start = np.maximum.accumulate(np.where(new_drive, np.arange(n), 0))
+    play_in_drive = np.arange(n) - drive_start
+
+    home_has_ball = (drive_in_game % 2 == 0)
+    home = games["home_team"].to_numpy()[game_idx]
+    away = games["away_team"].to_numpy()[game_idx]
+    posteam = np.where(home_has_ball, home, away)
+    defteam = np.where(home_has_ball, away, home)
+
+    # Drives after a score start with a kickoff, the rest start on first down
+    kickoff = new_drive & (rng.random(n) < 0.4)
+    kick_offset = kickoff[drive_start].astype(int)
+    down = np.where(kickoff, np.nan, (play_in_drive - kick_offset) % 4 + 1)
+
+    first_down_distance = np.where(rng.random(n) < 0.85, 10, rng.integers(1, 21, n))
+    ydstogo = np.where(down == 1, first_down_distance, rng.integers(1, 16, n)).astype(float)
+    ydstogo[kickoff] = 0
+
+    # Pass rate climbs with down and distance, as it does in real data
+    pass_prob = np.clip(0.45 + 0.08 * (np.nan_to_num(down) - 1) + 0.015 * (ydstogo - 10), 0.15, 0.9)
+    is_pass = rng.random(n) < pass_prob
+    play_type = np.where(is_pass, "pass", "run").astype(object)
+
+    fourth = down == 4
+    special = rng.random(n)
+    play_type[fourth & (special < 0.6)] = "punt"
+    play_type[fourth & (special >= 0.6) & (special < 0.85)] = "field_goal"
+    play_type[~kickoff & (rng.random(n) < 0.05)] = "no_play"
+    play_type[kickoff] = "kickoff"
+
+    scrimmage = (play_type == "run") | (play_type == "pass")
+    incomplete = (play_type == "pass") & (rng.random(n) < 0.36)
+    yards = np.where(
+        play_type == "pass",
+        np.round(rng.normal(11, 9, n)),
+        np.round(rng.normal(4.3, 5, n))
+    )
+    yards[incomplete | ~scrimmage] = 0
+
+    touchdown = (scrimmage & (rng.random(n) < 0.035)).astype(float)
+    epa = 0.12 * (yards - 0.4 * ydstogo - 2.5) + 3.0 * touchdown + rng.normal(0, 0.9, n)
+    epa[kickoff] = rng.normal(0, 0.3, kickoff.sum())
+
+    qtr = np.minimum(np.floor(progress * 4) + 1, 4)
+    qtr[(qtr == 4) & (progress > 0.995) & (rng.random(n) < 0.3)] = 5
+
+    # Home margin drifts toward the final margin as the game goes on,
+    # reported from the offense's point of view
+    final_margin = rng.normal(0, 13, n_games)[game_idx]
+    home_margin = np.round(final_margin * progress + rng.normal(0, 3, n))
+    score_differential = np.where(home_has_ball, home_margin, -home_margin)
+
+    week = games["week"].to_numpy()[game_idx]
+    game_id = np.char.add(
+        np.char.add(f"{season}_", np.char.zfill(week.astype(str), 2)),
+        np.char.add(np.char.add("_", away.astype(str)), np.char.add("_", home.astype(str)))
+    )
+
+    pbp = pd.DataFrame({
+        "play_id": play_in_game + 1,
+        "game_id": game_id,
+        "home_team": home,
+        "away_team": away,
+        "season_type": "REG",
+        "week": week,
+        "posteam": posteam,
+        "defteam": defteam,
+        "qtr": qtr,
+        "down": down,
+        "ydstogo": ydstogo,
+        "play_type": play_type,
+        "yards_gained": yards,
+        "pass": (play_type == "pass").astype(float),
+        "rush": (play_type == "run").astype(float),
+        "touchdown": touchdown,
+        "score_differential": score_differential,
+        "epa": epa,
+    })
+    pbp.loc[kickoff, "score_differential"] = np.nan
+    pbp["season"] = season
+    return pbp
+
+# --------------------
+# nfl_data_py-compatible entry point
+# --------------------
+def import_pbp_data(years, columns=None, include_participation=True, downcast=True, seed=SEED, **kwargs):
+    if not isinstance(years, (list, range)):
+        raise ValueError("Input must be list or range.")
+
+    pbp = pd.concat([synthetic_season(year, seed=seed) for year in years], ignore_index=True)
+
+    if columns:
+        pbp = pbp[[c for c in dict.fromkeys(list(columns) + ["season"]) if c in pbp.columns]]
+
+    if downcast:
+        cols = pbp.select_dtypes(include=[np.float64]).columns
+        pbp[cols] = pbp[cols].astype(np.float32)
+    return pbp
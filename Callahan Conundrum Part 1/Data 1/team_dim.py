@@ -0,0 +1,179 @@
+#team_dim.py
+
+#Team dimension: one row per franchise-season with the Pro-Football-Reference
+#code (oti, crd, rav, ...), the nflverse abbreviation used in play-by-play
+#that season (TEN, ARI, BAL, ... with OAK/LV, SD/LAC, STL/LA by era) and the
+#team's name that season. Names come from the Tm column of team_years.csv.
+#Lookups go through dict indexes, and join_team_years merges a whole league
+#metrics table with team_years in one pass instead of one filter per team.
+#
+#   python team_dim.py            # (re)build team_dim.csv from team_years.csv
+import os
+
+import numpy as np
+import pandas as pd
+
+from arrow_store import read_table
+from season_store import write_store
+
+# --------------------
+# Config
+# --------------------
+TEAM_YEARS_FILE = "team_years.csv"
+OUT_FILE = "team_dim.csv"
+
+# First season nflverse has play-by-play for; earlier rows have no abbreviation
+FIRST_PBP_SEASON = 1999
+
+# nflverse abbreviation per PFR code, as (first season, abbreviation) eras
+NFLVERSE_ERAS = {
+    "crd": [(FIRST_PBP_SEASON, "ARI")],
+    "atl": [(FIRST_PBP_SEASON, "ATL")],
+    "rav": [(FIRST_PBP_SEASON, "BAL")],
+    "buf": [(FIRST_PBP_SEASON, "BUF")],
+    "car": [(FIRST_PBP_SEASON, "CAR")],
+    "chi": [(FIRST_PBP_SEASON, "CHI")],
+    "cin": [(FIRST_PBP_SEASON, "CIN")],
+    "cle": [(FIRST_PBP_SEASON, "CLE")],
+    "dal": [(FIRST_PBP_SEASON, "DAL")],
+    "den": [(FIRST_PBP_SEASON, "DEN")],
+    "det": [(FIRST_PBP_SEASON, "DET")],
+    "gnb": [(FIRST_PBP_SEASON, "GB")],
+    "htx": [(FIRST_PBP_SEASON, "HOU")],
+    "clt": [(FIRST_PBP_SEASON, "IND")],
+    "jax": [(FIRST_PBP_SEASON, "JAX")],
+    "kan": [(FIRST_PBP_SEASON, "KC")],
+    "ram": [(FIRST_PBP_SEASON, "STL"), (2016, "LA")],
+    "sdg": [(FIRST_PBP_SEASON, "SD"), (2017, "LAC")],
+    "rai": [(FIRST_PBP_SEASON, "OAK"), (2020, "LV")],
+    "mia": [(FIRST_PBP_SEASON, "MIA")],
+    "min": [(FIRST_PBP_SEASON, "MIN")],
+    "nwe": [(FIRST_PBP_SEASON, "NE")],
+    "nor": [(FIRST_PBP_SEASON, "NO")],
+    "nyg": [(FIRST_PBP_SEASON, "NYG")],
+    "nyj": [(FIRST_PBP_SEASON, "NYJ")],
+    "phi": [(FIRST_PBP_SEASON, "PHI")],
+    "pit": [(FIRST_PBP_SEASON, "PIT")],
+    "sea": [(FIRST_PBP_SEASON, "SEA")],
+    "sfo": [(FIRST_PBP_SEASON, "SF")],
+    "tam": [(FIRST_PBP_SEASON, "TB")],
+    "oti": [(FIRST_PBP_SEASON, "TEN")],
+    "was": [(FIRST_PBP_SEASON, "WAS")],
+}
+
+DIM_COLUMNS = ["season", "pfr_code", "nflverse", "name", "franchise"]
+
+# --------------------
+# Build
+# --------------------
+# Vectorized: every era boundary is one masked assignment over the table
+def nflverse_column(pfr_codes, seasons):
+    out = np.full(len(pfr_codes), None, dtype=object)
+    for pfr_code, eras in NFLVERSE_ERAS.items():
+        team = pfr_codes == pfr_code
+        for first, code in eras:
+            out[team & (seasons >= first)] = code
+    return out
+
+def build_team_dim(team_years):
+    dim = pd.DataFrame({
+        "season": team_years["Year"].astype("int64"),
+        "pfr_code": team_years["team"],
+        # A trailing * marks a playoff season, not part of the name
+        "name": team_years["Tm"].str.rstrip("*"),
+    })
+    dim["nflverse"] = nflverse_column(dim["pfr_code"].to_numpy(), dim["season"].to_numpy())
+
+    # Franchise = the team's name in its latest season
+    latest = dim.sort_values("season").groupby("pfr_code")["name"].last()
+    dim["franchise"] = dim["pfr_code"].map(latest)
+
+    return dim[DIM_COLUMNS].sort_values(["pfr_code", "season"]).reset_index(drop=True)
+
+# --------------------
+# Indexed lookups
+# --------------------
+class TeamDim:
+    def __init__(self, table):
+        self.table = table
+        rows = table[DIM_COLUMNS].itertuples(index=False)
+
+        self.by_pfr = {}        # (pfr_code, season) -> row
+        self.by_nflverse = {}   # (nflverse, season) -> pfr_code
+        self.by_name = {}       # (name, season) -> pfr_code
+        self.alias = {}         # nflverse -> pfr_code, any season
+        for row in rows:
+            self.by_pfr[(row.pfr_code, row.season)] = row
+            self.by_name[(row.name, row.season)] = row.pfr_code
+            if isinstance(row.nflverse, str):
+                self.by_nflverse[(row.nflverse, row.season)] = row.pfr_code
+                self.alias[row.nflverse] = row.pfr_code
+
+    # Abbreviations are never reused by another franchise, so the season is
+    # only needed to tell eras apart in the other direction
+    def to_pfr(self, nflverse, season=None):
+        if season is None:
+            return self.alias.get(nflverse)
+        return self.by_nflverse.get((nflverse, season))
+
+    def to_nflverse(self, pfr_code, season):
+        row = self.by_pfr.get((pfr_code, season))
+        return None if row is None else row.nflverse
+
+    def name(self, pfr_code, season):
+        row = self.by_pfr.get((pfr_code, season))
+        return None if row is None else row.name
+
+    # (season, team) -> pfr_code key table for merges. Every abbreviation a
+    # franchise has used is accepted in all its seasons, so play-by-play
+    # cleaned to current locations (LA for the 2010 Rams) still matches.
+    def keys(self, team="team", season="season"):
+        abbrs = pd.DataFrame(
+            [(pfr_code, code) for pfr_code, eras in NFLVERSE_ERAS.items() for _, code in eras],
+            columns=["pfr_code", "nflverse"],
+        )
+        seasons = self.table.loc[self.table["season"] >= FIRST_PBP_SEASON, ["season", "pfr_code"]]
+        keys = seasons.merge(abbrs, on="pfr_code")[["season", "nflverse", "pfr_code"]]
+        return keys.rename(columns={"season": season, "nflverse": team})
+
+# Rebuilt whenever team_years.csv is newer than the stored dimension
+def load_team_dim(path=OUT_FILE, team_years_path=TEAM_YEARS_FILE):
+    stale = not os.path.exists(path) or (
+        os.path.exists(team_years_path) and os.path.getmtime(team_years_path) > os.path.getmtime(path)
+    )
+    if stale:
+        table = build_team_dim(read_table(team_years_path))
+        write_store(table, path)
+    else:
+        table = read_table(path)
+    return TeamDim(table)
+
+# --------------------
+# Join
+# --------------------
+# Adds team_years columns to a metrics table keyed by nflverse team and
+# season, for every team at once. Rows without a PFR match keep NaNs.
+def join_team_years(metrics, team_years, columns=None, dim=None, team="team", season="season"):
+    dim = dim or load_team_dim()
+    columns = columns or [c for c in team_years.columns if c not in ("team", "Year")]
+
+    pfr = team_years[["team", "Year"] + columns].rename(columns={"team": "pfr_code", "Year": season})
+    # Nullable ints, so unmatched rows don't turn PF/PA/PD into floats
+    pfr = pfr.astype({c: "Int64" for c in columns if pd.api.types.is_integer_dtype(pfr[c])})
+    joined = (
+        metrics.merge(dim.keys(team, season), on=[season, team], how="left", validate="many_to_one")
+               .merge(pfr, on=["pfr_code", season], how="left", validate="many_to_one")
+    )
+    return joined.drop(columns="pfr_code")
+
+# --------------------
+# MAIN
+# --------------------
+if __name__ == "__main__":
+    table = build_team_dim(read_table(TEAM_YEARS_FILE))
+    write_store(table, OUT_FILE)
+
+    unmapped = sorted(set(table["pfr_code"]) - set(NFLVERSE_ERAS))
+    print(f"{OUT_FILE}: {len(table)} team-seasons, {table['pfr_code'].nunique()} franchises")
+    if unmapped:
+        print(f"No nflverse abbreviation for: {unmapped}")
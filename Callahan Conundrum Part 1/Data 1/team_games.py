@@ -0,0 +1,91 @@
+#team_games.py
+
+#League-wide game-level table: one row per (game_id, team) with offensive and
+#defensive EPA per play, success rate and play counts, for every season.
+#Each run only adds the seasons that are not stored yet and refreshes the
+#in-progress one, so new games are upserted without recomputing the rest.
+import sys
+
+import pandas as pd
+
+from pbp_cache import load_pbp, prefetch_seasons
+from nfl_calendar import current_season
+from pbp_loader import run_seasons, default_workers
+from team_metrics import team_game_metrics
+from season_store import upsert, seasons_to_process
+from arrow_store import read_table
+
+# --------------------
+# Config
+# --------------------
+YEARS = list(range(2000, current_season() + 1))
+WORKERS = default_workers()
+
+OUT_GAMES = "team_games.csv"
+GAME_KEYS = ["game_id", "team"]
+
+# Seasons to recompute even if already stored (e.g. after an nflverse fix).
+# The in-progress season is always recomputed.
+REFRESH_SEASONS = []
+
+GAME_COLUMNS = [
+    "season", "game_id", "posteam", "defteam", "epa",
+    "down", "ydstogo", "yards_gained", "touchdown", "success_flag",
+]
+
+# --------------------
+# Per-season job (runs in a worker process)
+# --------------------
+def process_season(year):
+    print(f"\nLoading {year}...")
+    pbp = load_pbp(year, columns=GAME_COLUMNS)
+
+    if pbp is None or len(pbp) == 0:
+        print(f"No data for {year}")
+        return None
+    return team_game_metrics(pbp)
+
+# --------------------
+# Build / read
+# --------------------
+# Brings the table up to date for years; returns the seasons that could not
+# be built
+def update_team_games(years=YEARS, path=OUT_GAMES, refresh=(), workers=WORKERS):
+    stale = list(refresh) + [current_season()]
+    todo = seasons_to_process(path, years, stale=stale)
+    if not todo:
+        return []
+    print(f"Building games for {len(todo)} seasons: {todo}")
+
+    failed = prefetch_seasons(todo, columns=GAME_COLUMNS)
+    for year, error in sorted(failed.items()):
+        print(f"FAILED {year}: {error}")
+
+    results = run_seasons([y for y in todo if y not in failed], process_season, workers=workers)
+    if results:
+        new_rows = pd.concat([games for _, games in results], ignore_index=True)
+        upsert(path, new_rows, keys=GAME_KEYS)
+
+    done = {year for year, _ in results}
+    return [y for y in todo if y not in done]
+
+# Week-by-week rows for one team, read from the stored table
+def team_games(team, seasons=None, path=OUT_GAMES):
+    games = read_table(path)
+    games = games[games["team"] == team]
+    if seasons is not None:
+        games = games[games["season"].isin(list(seasons))]
+    return games.sort_values(["season", "week"]).reset_index(drop=True)
+
+# --------------------
+# MAIN
+# --------------------
+if __name__ == "__main__":
+    missing = update_team_games(refresh=REFRESH_SEASONS)
+
+    print("\nDone.")
+    print(f"- {OUT_GAMES}")
+
+    if missing:
+        print(f"\nMissing {len(missing)} seasons: {missing}")
+        sys.exit(1)
@@ -0,0 +1,339 @@
+#team_metrics.py
+
+#Season metrics for every team in one grouped pass over play-by-play
+import pandas as pd
+import numpy as np
+
+# --------------------
+# Success rate kernel
+# --------------------
+# Share of yards-to-go a play must gain to count as a success, indexed by
+# down. Index 0 catches plays with no down (kickoffs, penalties, ...).
+SUCCESS_THRESHOLDS = np.array([np.nan, 0.5, 0.7, 1.0, 1.0], dtype=np.float32)
+
+SUCCESS_INPUTS = ["down", "ydstogo", "yards_gained", "touchdown"]
+
+# Works on plain NumPy arrays. Yardage is compared in float32, the dtype
+# nflverse play-by-play is downcast to, so results match the old
+# Series-based helper exactly.
+def success_kernel(down, ydstogo, yards_gained, touchdown):
+    down_idx = np.nan_to_num(down, nan=0).astype(np.intp)
+    down_idx[(down_idx < 0) | (down_idx > 4)] = 0
+
+    yg = ydstogo.astype(np.float32)
+    yg[yg == 0] = np.nan
+    gained = np.nan_to_num(yards_gained.astype(np.float32), nan=0)
+
+    with np.errstate(invalid="ignore"):
+        success = gained >= SUCCESS_THRESHOLDS[down_idx] * yg
+    success |= touchdown == 1
+    return success
+
+def compute_success(df):
+    arrays = [df[c].to_numpy(dtype=np.float64, na_value=np.nan) for c in SUCCESS_INPUTS]
+    return pd.Series(success_kernel(*arrays), index=df.index)
+
+# --------------------
+# Row filters
+# --------------------
+def early_down_mask(pbp):
+    return pbp["down"].isin([1, 2])
+
+# Neutral situations (PROE)
+def neutral_mask(pbp):
+    return (
+        (pbp["down"].isin([1, 2])) &
+        (pbp["ydstogo"] <= 10) &
+        (pbp["qtr"] <= 3) &
+        (pbp["score_differential"].between(-10, 10)) &
+        (pbp["play_type"].isin(["run", "pass"]))
+    ).fillna(False).astype(bool)
+
+FILTERS = {
+    "early_down": early_down_mask,
+    "neutral": neutral_mask,
+}
+
+# --------------------
+# League neutral pass-rate baseline
+# --------------------
+# Built once per season and cached next to the play-by-play (see
+# pbp_cache.load_neutral_baseline), so PROE for any team is a lookup
+# instead of another filter over the whole league.
+# Neutral plays are 10 yards to go or less: 0-3, 4-6 and 7-10
+DISTANCE_BUCKETS = [-np.inf, 3, 6, 10]
+DISTANCE_LABELS = ["short", "medium", "long"]
+
+def distance_bucket(ydstogo):
+    return pd.cut(ydstogo.astype("float64"), bins=DISTANCE_BUCKETS, labels=DISTANCE_LABELS)
+
+# Plays and passes per season (and optionally per down / distance bucket).
+# Counts add up, so tables built from chunks combine with combine_baselines().
+def neutral_baseline(pbp, by=()):
+    neutral = pbp[neutral_mask(pbp)]
+    work = pd.DataFrame({
+        "season": neutral["season"],
+        "passes": neutral["pass"].to_numpy(dtype=np.float64, na_value=np.nan),
+    })
+    if "down" in by:
+        work["down"] = neutral["down"]
+    if "distance_bucket" in by:
+        work["distance_bucket"] = distance_bucket(neutral["ydstogo"])
+
+    keys = ["season"] + list(by)
+    table = work.groupby(keys, observed=True).agg(
+        plays=("passes", "count"),
+        passes=("passes", "sum"),
+    ).reset_index()
+    table["pass_rate"] = table["passes"] / table["plays"]
+    return table
+
+def combine_baselines(tables, by=()):
+    keys = ["season"] + list(by)
+    table = pd.concat(tables).groupby(keys, observed=True)[["plays", "passes"]].sum().reset_index()
+    table["pass_rate"] = table["passes"] / table["plays"]
+    return table
+
+# Collapse a down / distance split back to one expected rate per season
+def season_baseline(baseline):
+    return combine_baselines([baseline[["season", "plays", "passes"]]])
+
+# --------------------
+# Metric registry
+# --------------------
+# Every metric is declared once: which side of the ball it groups on, the
+# play-by-play column it reduces, an optional row filter and a pandas
+# reducer. aggregate() compiles the whole registry into one named
+# aggregation per grouping key, so a new metric never adds another scan.
+SIDES = {
+    "off": ["season", "posteam"],
+    "def": ["season", "defteam"],
+}
+
+def metric(name, side, column, reducer="mean", filter=None, keep=True):
+    # Filters work by blanking rows to NaN, and size counts NaN rows too
+    if reducer == "size" and filter is not None:
+        raise ValueError(f"Metric {name}: filter {filter!r} has no effect with reducer='size'; use 'count'")
+    return {
+        "name": name,
+        "side": side,
+        "column": column,
+        "reducer": reducer,
+        "filter": filter,
+        "keep": keep,
+    }
+
+METRICS = [
+    metric("plays", "off", "epa", reducer="size"),
+    metric("off_epa_per_play", "off", "epa"),
+    metric("off_early_epa_per_play", "off", "epa", filter="early_down"),
+    metric("off_success_rate_pct", "off", "success_flag"),
+    metric("def_epa_per_play", "def", "epa"),
+    metric("def_early_epa_per_play", "def", "epa", filter="early_down"),
+    metric("def_success_rate_pct", "def", "success_flag"),
+    metric("neutral_pass_rate", "off", "pass", filter="neutral", keep=False),
+]
+
+# Game grain: one row per (game_id, team), for week-by-week charts
+GAME_SIDES = {
+    "off": ["season", "game_id", "posteam"],
+    "def": ["season", "game_id", "defteam"],
+}
+
+GAME_METRICS = [
+    metric("off_plays", "off", "epa", reducer="size"),
+    metric("off_epa_game", "off", "epa"),
+    metric("off_success_rate_pct", "off", "success_flag"),
+    metric("def_plays", "def", "epa", reducer="size"),
+    metric("def_epa_game", "def", "epa"),
+    metric("def_success_rate_pct", "def", "success_flag"),
+]
+
+# Metrics built from other metrics once the grouped tables are joined.
+# league_neutral_pass_rate comes from the neutral baseline table.
+DERIVED_METRICS = {
+    "proe_pct_points": lambda t: (t["neutral_pass_rate"] - t["league_neutral_pass_rate"]) * 100,
+}
+
+# --------------------
+# Aggregation engine
+# --------------------
+# Builds the frame a side is grouped over: the keys plus one column per
+# distinct (column, filter) pair. Returns it with each metric's source column.
+def side_frame(pbp, metrics, keys):
+    work = {k: pbp[k] for k in keys}
+    masks = {}
+    sources = {}
+
+    for m in metrics:
+        source = m["column"] if m["filter"] is None else f"{m['column']}__{m['filter']}"
+
+        if source not in work:
+            # Reduce in float64 so float32 EPA keeps the precision of the old
+            # output; compact nullable ints (see pbp_schema.py) become NaN-aware
+            values = pbp[m["column"]]
+            if values.dtype != np.float64:
+                values = pd.Series(
+                    values.to_numpy(dtype=np.float64, na_value=np.nan),
+                    index=values.index
+                )
+
+            # Rows outside the filter become NaN, which mean() skips
+            if m["filter"] is not None:
+                if m["filter"] not in masks:
+                    masks[m["filter"]] = FILTERS[m["filter"]](pbp)
+                values = values.where(masks[m["filter"]])
+
+            work[source] = values
+
+        sources[m["name"]] = source
+
+    return pd.DataFrame(work), sources
+
+def aggregate_side(pbp, metrics, keys):
+    work, sources = side_frame(pbp, metrics, keys)
+    named = {m["name"]: (sources[m["name"]], m["reducer"]) for m in metrics}
+    return work.groupby(keys, observed=True).agg(**named).reset_index()
+
+# The keys both sides are joined on, with posteam / defteam read as "team"
+def join_keys(sides):
+    return ["team" if k == "posteam" else k for k in sides["off"]]
+
+def join_sides(tables, metrics=METRICS, derived=DERIVED_METRICS, baseline=None, sides=SIDES):
+    tables = {
+        side: t.rename(columns={"posteam": "team", "defteam": "team"})
+        for side, t in tables.items()
+    }
+
+    season_df = tables["off"].merge(tables["def"], on=join_keys(sides))
+
+    if baseline is not None:
+        rates = season_baseline(baseline)[["season", "pass_rate"]]
+        rates = rates.rename(columns={"pass_rate": "league_neutral_pass_rate"})
+        rates["season"] = rates["season"].astype(season_df["season"].dtype)
+        season_df = season_df.merge(rates, on="season", how="left")
+
+    for name, fn in derived.items():
+        season_df[name] = fn(season_df)
+
+    hidden = [m["name"] for m in metrics if not m["keep"]] + ["league_neutral_pass_rate"]
+    return season_df.drop(columns=[c for c in hidden if c in season_df.columns])
+
+def side_metrics(metrics, side):
+    return [m for m in metrics if m["side"] == side]
+
+def aggregate(pbp, metrics=METRICS, derived=DERIVED_METRICS, baseline=None, sides=SIDES):
+    # Only derived metrics (PROE) need the league baseline
+    if baseline is None and derived:
+        baseline = neutral_baseline(pbp)
+
+    tables = {}
+    for side, keys in sides.items():
+        if side_metrics(metrics, side):
+            tables[side] = aggregate_side(pbp, side_metrics(metrics, side), keys)
+    return join_sides(tables, metrics, derived, baseline, sides)
+
+# --------------------
+# Streaming accumulators
+# --------------------
+# For long histories the same registry can be fed chunk by chunk. Each
+# chunk becomes per-key sums and counts; those merge by addition, and
+# finalize() divides them back into the means aggregate() would return.
+STREAMABLE_REDUCERS = ["mean", "size"]
+
+def partial_aggregate(pbp, metrics=METRICS):
+    if "success_flag" not in pbp.columns:
+        pbp = pbp.assign(success_flag=compute_success(pbp))
+
+    parts = {}
+    for side, keys in SIDES.items():
+        metrics_here = side_metrics(metrics, side)
+        if not metrics_here:
+            continue
+
+        work, sources = side_frame(pbp, metrics_here, keys)
+        named = {}
+        for m in metrics_here:
+            if m["reducer"] not in STREAMABLE_REDUCERS:
+                raise ValueError(f"Metric {m['name']} uses {m['reducer']}, which cannot be streamed")
+            if m["reducer"] == "size":
+                named[f"{m['name']}__count"] = (sources[m["name"]], "size")
+            else:
+                named[f"{m['name']}__sum"] = (sources[m["name"]], "sum")
+                named[f"{m['name']}__count"] = (sources[m["name"]], "count")
+
+        parts[side] = work.groupby(keys, observed=True).agg(**named)
+    return parts
+
+def merge_partials(acc, parts):
+    if acc is None:
+        return parts
+    return {
+        side: pd.concat([acc[side], parts[side]]).groupby(level=SIDES[side], observed=True).sum()
+        for side in parts
+    }
+
+def finalize(acc, metrics=METRICS, derived=DERIVED_METRICS, baseline=None):
+    tables = {}
+    for side, part in acc.items():
+        table = pd.DataFrame(index=part.index)
+        for m in side_metrics(metrics, side):
+            if m["reducer"] == "size":
+                table[m["name"]] = part[f"{m['name']}__count"]
+            else:
+                table[m["name"]] = part[f"{m['name']}__sum"] / part[f"{m['name']}__count"].replace(0, np.nan)
+        tables[side] = table.reset_index()
+
+    season_df = join_sides(tables, metrics, derived, baseline)
+    return season_df.sort_values(["season", "team"]).reset_index(drop=True)
+
+# --------------------
+# League-wide team-season table
+# --------------------
+# One row per (season, team). Offense is grouped on posteam and defense on
+# defteam, so every team is handled by the same scan of the season frame.
+def team_season_metrics(pbp, baseline=None):
+    # Cached play-by-play already carries the flag, see pbp_cache.py
+    if "success_flag" not in pbp.columns:
+        pbp = pbp.assign(success_flag=compute_success(pbp))
+
+    season_df = aggregate(pbp, baseline=baseline)
+    return season_df.sort_values(["season", "team"]).reset_index(drop=True)
+
+# Same table from an iterable of play-by-play chunks (any number of
+# seasons); only the current chunk and the accumulators are in memory.
+def team_season_metrics_streaming(chunks, baseline=None):
+    acc = None
+    baselines = []
+    for chunk in chunks:
+        acc = merge_partials(acc, partial_aggregate(chunk))
+        if baseline is None:
+            baselines.append(neutral_baseline(chunk))
+    if acc is None:
+        return None
+
+    if baseline is None:
+        baseline = combine_baselines(baselines)
+    return finalize(acc, baseline=baseline)
+
+# --------------------
+# League-wide team-game table
+# --------------------
+# One row per (game_id, team) with both sides of the ball. Week and opponent
+# come from the game id ("2023_01_TEN_NO" is week 1, TEN at NO), so byes and
+# missing games never shift the week numbers.
+def team_game_metrics(pbp):
+    if "success_flag" not in pbp.columns:
+        pbp = pbp.assign(success_flag=compute_success(pbp))
+
+    games = aggregate(pbp, GAME_METRICS, derived={}, sides=GAME_SIDES)
+    games["game_id"] = games["game_id"].astype(str)
+    games["team"] = games["team"].astype(str)
+
+    parts = games["game_id"].str.split("_", expand=True)
+    games.insert(1, "week", parts[1].astype(int))
+    games.insert(4, "opponent", parts[2].where(parts[2] != games["team"], parts[3]))
+    return games.sort_values(["season", "week", "team"]).reset_index(drop=True)
+
+def team_slice(season_df, team):
+    return season_df[season_df["team"] == team].drop(columns=["team"]).reset_index(drop=True)
@@ -1,41 +1,111 @@
 #team_years.py
 
 #extract team labels
-import requests
+import os
+import asyncio
+
 from bs4 import BeautifulSoup
 import lxml
 import pandas as pd
-import time
-import random
 
-#Extract team codes
-url = "https://www.pro-football-reference.com/teams/"
-res = requests.get(url)
-soup = BeautifulSoup(res.text, "lxml")
+from pfr_tables import extract_table
+from pfr_client import PFRClient, fetch_pages, REQUESTS_PER_MINUTE
+from nfl_calendar import current_season
+from season_store import read_store, write_store, upsert
+
+OUT_FILE = "team_years.csv"
+KEYS = ["team", "Year"]
+
+# Rows that can still change: every team's in-progress season is refreshed,
+# plus any (team, Year) listed here after a correction on the site,
+# e.g. [("oti", 2019)]
+REFRESH_ROWS = []
 
-team_codes = []
-for a in soup.select("table#teams_active tbody tr th a"):
-    href = a["href"]   # e.g. "/teams/crd/"
-    code = href.split("/")[2]  # "crd"
-    team_codes.append(code)
-    time.sleep(random.uniform(0.5, 1.8))
+# Rebuild the whole table from every franchise page (TEAM_YEARS_FULL=1).
+# Otherwise an existing table only has the rows above re-scraped and upserted.
+FULL_REBUILD = os.environ.get("TEAM_YEARS_FULL") == "1"
 
+#Extract team codes from the index page
+def team_codes_from_index(html):
+    soup = BeautifulSoup(html, "lxml")
 
-#Loop through each team code and extract data
-all_team_years = []
+    team_codes = []
+    for a in soup.select("table#teams_active tbody tr th a"):
+        href = a["href"]   # e.g. "/teams/crd/"
+        code = href.split("/")[2]  # "crd"
+        team_codes.append(code)
+    return team_codes
 
-for team in team_codes:
-    url = f"https://www.pro-football-reference.com/teams/{team}/"
-    df = pd.read_html(url, header=1)[0]
+#Franchise history table from one team page; rows that aren’t numeric
+#seasons are dropped by the extractor
+FRANCHISE_TABLE = "team_index"
 
-    # Drop rows that aren’t numeric seasons
-    df = df[df["Year"].astype(str).str.isnumeric()]
+def parse_team_page(html, team):
+    df = extract_table(html, FRANCHISE_TABLE, key="Year")
 
     # Add team code
     df["team"] = team
+    return df
+
+#Index first (unless the teams are already known), then every team page
+#concurrently. One client for all of them: shared connection pool, shared
+#rate limit.
+async def fetch_team_pages(team_codes=None):
+    client = PFRClient()
+    try:
+        if team_codes is None:
+            team_codes = team_codes_from_index(await client.get_text("/teams/"))
+        print(f"Fetching {len(team_codes)} team pages at up to {REQUESTS_PER_MINUTE:.0f} requests/minute...")
+        pages = await fetch_pages([f"/teams/{team}/" for team in team_codes], client)
+    finally:
+        client.close()
+
+    stats = client.stats
+    print(f"{stats['downloaded']} pages downloaded ({stats['bytes'] / 1024:.0f} KB), "
+          f"{stats['not_modified']} unchanged, {stats['offline']} served offline")
+    return team_codes, pages
+
+#Teams in the order they were first stored (the index order), newest season first
+def franchise_order(df):
+    rank = {team: i for i, team in enumerate(dict.fromkeys(df["team"]))}
+    return (
+        df.assign(_rank=df["team"].map(rank))
+          .sort_values(["_rank", "Year"], ascending=[True, False], kind="stable")
+          .drop(columns="_rank")
+    )
+
+#{team: years} that may differ from what is stored
+def changeable_rows(stored, season):
+    rows = {team: {season} for team in dict.fromkeys(stored["team"])}
+    for team, year in REFRESH_ROWS:
+        rows.setdefault(team, set()).add(year)
+    return rows
+
+def full_rebuild():
+    team_codes, pages = asyncio.run(fetch_team_pages())
+
+    #Parse in index order so the table keeps the same row order
+    all_team_years = [parse_team_page(pages[f"/teams/{team}/"], team) for team in team_codes]
+    team_years = pd.concat(all_team_years, ignore_index=True)
+    write_store(team_years, OUT_FILE)
+    print(f"Rebuilt {OUT_FILE}: {len(team_years)} rows")
+
+def incremental_refresh(stored):
+    rows = changeable_rows(stored, current_season())
+    team_codes, pages = asyncio.run(fetch_team_pages(list(rows)))
 
-    all_team_years.append(df)
+    new_rows = []
+    for team in team_codes:
+        df = parse_team_page(pages[f"/teams/{team}/"], team)
+        new_rows.append(df[df["Year"].isin(rows[team])])
+    new_rows = pd.concat(new_rows, ignore_index=True)
 
-team_years = pd.concat(all_team_years, ignore_index=True)
+    upsert(OUT_FILE, new_rows, keys=KEYS, order=franchise_order)
+    print(f"Refreshed {len(new_rows)} rows of {OUT_FILE}")
 
-team_years.to_csv("team_years.csv", index=False)
\ No newline at end of file
+if __name__ == "__main__":
+    stored = read_store(OUT_FILE)
+    if FULL_REBUILD or stored.empty:
+        full_rebuild()
+    else:
+        incremental_refresh(stored)
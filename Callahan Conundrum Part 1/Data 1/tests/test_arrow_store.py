@@ -0,0 +1,22 @@
+#test_arrow_store.py
+
+#read_table returns what pd.read_csv returns, whatever frame wrote the CSV.
+import pandas as pd
+
+import arrow_store
+from season_store import write_store
+
+def test_cached_table_matches_read_csv(tmp_path, monkeypatch):
+    monkeypatch.setattr(arrow_store, "ARROW_CACHE_DIR", str(tmp_path / "arrow_cache"))
+    csv_path = str(tmp_path / "metrics.csv")
+
+    # The in-memory frame has types the CSV text cannot carry
+    df = pd.DataFrame({
+        "season": pd.Series([2023, 2024], dtype="int16"),
+        "team": pd.Categorical(["TEN", "TEN"]),
+        "epa": pd.Series([0.25, -0.125], dtype="float32"),
+    })
+    write_store(df, csv_path)
+
+    assert arrow_store.open_arrow(csv_path) is not None
+    pd.testing.assert_frame_equal(arrow_store.read_table(csv_path), pd.read_csv(csv_path))
@@ -0,0 +1,113 @@
+#test_pbp_download.py
+
+#pbp_download.py against standin_server.py: retries on 503s, resumes bodies
+#cut off mid-transfer, gives up with DownloadError, and re-downloads on refresh.
+import os
+import random
+
+import pytest
+
+import pbp_cache
+import pbp_download
+import standin_server
+
+YEAR = 2001
+
+# --------------------
+# Fixtures
+# --------------------
+@pytest.fixture(scope="module")
+def recorded(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("recorded")
+    standin_server.record_synthetic(str(directory), [YEAR])
+    return directory
+
+@pytest.fixture
+def serve(recorded, tmp_path, monkeypatch):
+    monkeypatch.setattr(pbp_download, "RAW_DIR", str(tmp_path / "raw"))
+    # Retry-After is 1 s on every 503; the tests don't need to wait for it
+    monkeypatch.setattr(pbp_download, "BACKOFF_MAX_S", 0.0)
+    # The stand-in draws from the global generator; with this seed the first
+    # request of each test below is the one that fails or gets cut off
+    random.seed(4)
+    servers = []
+
+    def start(**behavior):
+        server, base_url = standin_server.start_in_background(str(recorded), **behavior)
+        servers.append(server)
+        monkeypatch.setattr(pbp_download, "PBP_BASE_URL", base_url)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def season_bytes(recorded):
+    return (recorded / f"play_by_play_{YEAR}.parquet").read_bytes()
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+# --------------------
+# Tests
+# --------------------
+def test_retries_through_server_errors(serve, recorded, capsys):
+    serve(fail_rate=0.5)
+    path = pbp_download.download_season(YEAR, max_attempts=20)
+
+    assert read(path) == season_bytes(recorded)
+    assert "Retrying 2001" in capsys.readouterr().out
+
+def test_resumes_dropped_bodies_with_range(serve, recorded, capsys):
+    serve(drop_rate=0.5)
+    path = pbp_download.download_season(YEAR, max_attempts=20)
+
+    assert read(path) == season_bytes(recorded)
+    out, err = capsys.readouterr()
+    assert "Retrying 2001" in out
+    # The retries asked for the rest of the file, not the whole file again
+    assert '" 206 ' in err
+
+def test_restarts_when_if_range_does_not_match(serve, recorded):
+    serve()
+    data = season_bytes(recorded)
+    raw = pbp_download.raw_path(YEAR)
+    os.makedirs(pbp_download.RAW_DIR)
+    with open(pbp_download.part_path(YEAR), "wb") as f:
+        f.write(b"x" * 1000)
+    pbp_download.write_validator(YEAR, '"an-older-upload"')
+
+    assert pbp_download.download_season(YEAR) == raw
+    assert read(raw) == data
+
+def test_gives_up_after_max_attempts(serve):
+    serve(fail_rate=1.0)
+    with pytest.raises(pbp_download.DownloadError, match="gave up after 3 attempts"):
+        pbp_download.download_season(YEAR, max_attempts=3)
+
+def test_missing_season_is_final(serve):
+    serve()
+    with pytest.raises(pbp_download.DownloadError, match="HTTP 404"):
+        pbp_download.download_season(YEAR + 1)
+
+def test_download_seasons_reports_failures(serve, recorded):
+    serve()
+    paths, failures = pbp_download.download_seasons([YEAR, YEAR + 1])
+
+    assert read(paths[YEAR]) == season_bytes(recorded)
+    assert list(failures) == [YEAR + 1]
+
+def test_refresh_discards_stale_files(serve, recorded, tmp_path, monkeypatch):
+    serve()
+    monkeypatch.setattr(pbp_cache, "PBP_SOURCE", "nflverse")
+    monkeypatch.setattr(pbp_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    os.makedirs(pbp_download.RAW_DIR)
+    for path in (pbp_download.raw_path(YEAR), pbp_download.part_path(YEAR)):
+        with open(path, "wb") as f:
+            f.write(b"an earlier download")
+
+    assert pbp_cache.prefetch_seasons([YEAR], refresh=True) == {}
+    assert read(pbp_download.raw_path(YEAR)) == season_bytes(recorded)
+    assert not os.path.exists(pbp_download.part_path(YEAR))
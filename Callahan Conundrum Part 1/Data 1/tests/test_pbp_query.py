@@ -0,0 +1,94 @@
+#test_pbp_query.py
+
+#query_pbp on synthetic partitions must return exactly what a full load_pbp
+#plus a plain pandas mask returns, and every row group it skips must hold no
+#matching play.
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import pbp_cache
+import pbp_query
+from team_metrics import early_down_mask, neutral_mask
+
+SEASONS = [2001, 2002]
+TEAM = "TEN"
+COLUMNS = ["game_id", "posteam", "defteam", "down", "qtr", "epa"]
+ALL_COLUMNS = COLUMNS + ["ydstogo", "score_differential", "play_type", "pass"]
+
+# query_pbp keyword arguments -> the same filter written directly in pandas
+CASES = {
+    "off": (dict(team=TEAM, side="off"), lambda p: p["posteam"] == TEAM),
+    "def": (dict(team=TEAM, side="def"), lambda p: p["defteam"] == TEAM),
+    "any": (dict(team=TEAM), lambda p: (p["posteam"] == TEAM) | (p["defteam"] == TEAM)),
+    "downs": (dict(team=TEAM, side="off", downs=3), lambda p: (p["posteam"] == TEAM) & (p["down"] == 3)),
+    "quarters": (dict(quarters=[4, 5]), lambda p: p["qtr"].isin([4, 5])),
+    "early_down": (
+        dict(team=TEAM, side="off", situation="early_down"),
+        lambda p: (p["posteam"] == TEAM) & early_down_mask(p),
+    ),
+    "neutral": (
+        dict(team=TEAM, side="off", situation="neutral"),
+        lambda p: (p["posteam"] == TEAM) & neutral_mask(p),
+    ),
+}
+
+@pytest.fixture(scope="module")
+def cache(tmp_path_factory):
+    patch = pytest.MonkeyPatch()
+    patch.setattr(pbp_cache, "PBP_SOURCE", "synthetic")
+    patch.setattr(pbp_cache, "CACHE_DIR", str(tmp_path_factory.mktemp("pbp_cache")))
+    for year in SEASONS:
+        pbp_cache.ensure_partition(year, columns=ALL_COLUMNS)
+    yield
+    patch.undo()
+
+def expected(kwargs_mask, seasons=SEASONS):
+    _, mask = kwargs_mask
+    frames = []
+    for year in seasons:
+        pbp = pbp_cache.load_pbp(year, columns=ALL_COLUMNS)
+        frames.append(pbp[mask(pbp).fillna(False).astype(bool)])
+    return pd.concat(frames, ignore_index=True)[["season"] + COLUMNS]
+
+@pytest.mark.parametrize("case", CASES)
+def test_query_matches_full_load_and_mask(cache, case):
+    kwargs, _ = CASES[case]
+    got = pbp_query.query_pbp(SEASONS, columns=COLUMNS, **kwargs)
+
+    want = expected(CASES[case])
+    assert len(want) > 0
+    pd.testing.assert_frame_equal(got, want)
+
+@pytest.mark.parametrize("case", CASES)
+def test_skipped_row_groups_hold_no_matches(cache, case):
+    kwargs, mask = CASES[case]
+    clauses = pbp_query.build_clauses(**kwargs)
+    for year in SEASONS:
+        path = pbp_cache.partition_path(year)
+        parquet = pq.ParquetFile(path)
+        kept = pbp_query.matching_row_groups(path, clauses)
+
+        for i in set(range(parquet.num_row_groups)) - set(kept):
+            group = pbp_cache.apply_schema(parquet.read_row_group(i).to_pandas())
+            assert not mask(group).fillna(False).astype(bool).any()
+
+def test_team_queries_skip_row_groups(cache):
+    # Partitions are sorted by posteam, so one offense spans few row groups
+    path = pbp_cache.partition_path(SEASONS[0])
+    kept = pbp_query.matching_row_groups(path, pbp_query.build_clauses(team=TEAM, side="off"))
+    assert 0 < len(kept) < pq.ParquetFile(path).num_row_groups
+
+def test_teams_on_row_group_edges_are_kept(cache):
+    # A team that is exactly a row group's min or max posteam is in that group
+    path = pbp_cache.partition_path(SEASONS[0])
+    parquet = pq.ParquetFile(path)
+    for i in range(parquet.num_row_groups):
+        teams = parquet.read_row_group(i, columns=["posteam"]).column(0).drop_null().to_pylist()
+        for team in (min(teams), max(teams)):
+            clauses = pbp_query.build_clauses(team=team, side="off")
+            assert i in pbp_query.matching_row_groups(path, clauses)
+
+def test_unknown_side_is_rejected():
+    with pytest.raises(ValueError, match="side must be"):
+        pbp_query.build_clauses(team=TEAM, side="special_teams")
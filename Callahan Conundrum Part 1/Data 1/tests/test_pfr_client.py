@@ -0,0 +1,141 @@
+#test_pfr_client.py
+
+#PFRClient against pfr_standin.py: 429 and 503 answers are retried, the
+#token bucket spaces requests out, and the stand-in enforces its per-minute
+#limit the way the site does.
+import os
+import time
+import random
+import asyncio
+
+import pytest
+import requests
+
+import pfr_client
+import pfr_standin
+from pfr_client import PFRClient, fetch_pages
+
+PATHS = [f"/teams/t{i}/" for i in range(5)]
+
+# --------------------
+# Fixtures
+# --------------------
+@pytest.fixture(scope="module")
+def recorded(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("recorded_pfr")
+    for path in PATHS:
+        pfr_standin.write_page(str(directory), path, f"<html><body>{path}</body></html>")
+    return directory
+
+@pytest.fixture
+def serve(recorded, monkeypatch):
+    # One request at a time, so the stand-in's seeded draws land on the same
+    # requests every run; the first one of each retry test fails
+    monkeypatch.setattr(pfr_client, "MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(pfr_client, "MAX_ATTEMPTS", 20)
+    random.seed(4)
+    servers = []
+
+    def start(**behavior):
+        # Retry-After: 0 so retries don't sleep
+        behavior = {"retry_after": 0, **behavior}
+        server, base_url = pfr_standin.start_in_background(str(recorded), **behavior)
+        servers.append(server)
+        return server, base_url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def fetch_all(base_url, paths=PATHS, requests_per_minute=60_000, cache_dir=None):
+    client = PFRClient(
+        base_url, requests_per_minute=requests_per_minute,
+        concurrency=pfr_client.MAX_CONCURRENCY, cache_dir=cache_dir,
+    )
+    try:
+        return asyncio.run(fetch_pages(paths, client))
+    finally:
+        client.close()
+
+# --------------------
+# Tests
+# --------------------
+@pytest.mark.parametrize("behavior, status", [
+    ({"throttle_rate": 0.5}, 429),
+    ({"error_rate": 0.5}, 503),
+    # Retry-After may also be an HTTP-date; one in the past means retry now
+    ({"throttle_rate": 0.5, "retry_after": "Wed, 21 Oct 2015 07:28:00 GMT"}, 429),
+])
+def test_retries_until_every_page_arrives(serve, behavior, status, capsys):
+    server, base_url = serve(**behavior)
+    pages = fetch_all(base_url)
+
+    assert pages == {path: f"<html><body>{path}</body></html>" for path in PATHS}
+    assert server.statuses[status] > 0
+    assert server.statuses[200] == len(PATHS)
+    out = capsys.readouterr().out
+    assert "retrying" in out or "waiting" in out
+
+@pytest.mark.parametrize("value, expected", [
+    (None, 7.0),
+    ("3", 3.0),
+    ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+    ("soon", 7.0),
+])
+def test_retry_after_seconds(value, expected):
+    response = requests.Response()
+    if value is not None:
+        response.headers["Retry-After"] = value
+    assert pfr_client.retry_after_seconds(response, 7.0) == expected
+
+def test_gives_up_after_max_attempts(serve):
+    _, base_url = serve(error_rate=1.0)
+    with pytest.raises(requests.HTTPError, match="503"):
+        fetch_all(base_url, PATHS[:1])
+
+def test_token_bucket_spaces_requests(serve):
+    server, base_url = serve()
+    start = time.perf_counter()
+    fetch_all(base_url, requests_per_minute=600)
+
+    # One token up front, then one every 0.1 s
+    assert time.perf_counter() - start >= 0.1 * (len(PATHS) - 1)
+    assert server.statuses[200] == len(PATHS)
+
+def test_standin_per_minute_limit(serve):
+    server, base_url = serve(limit_per_minute=len(PATHS))
+    fetch_all(base_url)
+    assert server.statuses == {200: len(PATHS)}
+
+    # The window is full: every attempt is turned away until the client gives up
+    with pytest.raises(requests.HTTPError, match="429"):
+        fetch_all(base_url, PATHS[:1])
+    assert server.statuses[429] > 0
+
+def test_not_modified_without_cached_body_fetches_again(serve, tmp_path, monkeypatch):
+    server, base_url = serve()
+    path = PATHS[0]
+    fetch_all(base_url, [path], cache_dir=str(tmp_path))
+
+    # Validators are sent, then the body disappears before the 304 is handled
+    real_load = pfr_client.ResponseCache.load
+    def load_without_body(cache, url):
+        body_path, _ = cache.paths(url)
+        if os.path.exists(body_path):
+            os.remove(body_path)
+        return real_load(cache, url)
+    monkeypatch.setattr(pfr_client.ResponseCache, "load", load_without_body)
+
+    assert fetch_all(base_url, [path], cache_dir=str(tmp_path)) == {path: f"<html><body>{path}</body></html>"}
+    assert server.statuses == {200: 2, 304: 1}
+
+def test_validators_come_from_metadata(serve, tmp_path):
+    _, base_url = serve()
+    fetch_all(base_url, PATHS[:1], cache_dir=str(tmp_path))
+    cache = pfr_client.ResponseCache(str(tmp_path))
+    url = f"{base_url}{PATHS[0]}"
+
+    assert set(cache.validators(url)) == {"If-None-Match", "If-Modified-Since"}
+    os.remove(cache.paths(url)[0])
+    assert cache.validators(url) == {}
@@ -0,0 +1,47 @@
+#test_pfr_tables.py
+
+#extract_table on small hand-written tables: colspans are expanded the way
+#pd.read_html expands them, and rows that still don't fit are counted.
+import pandas as pd
+
+from pfr_tables import extract_table
+
+PAGE = """
+<html><body>
+<table id="team_index">
+<thead>
+<tr><th colspan="2">Season</th><th>Points</th></tr>
+<tr><th>Year</th><th>Lg</th><th>PF</th></tr>
+</thead>
+<tbody>
+<tr><th>2001</th><td>NFL</td><td>336</td></tr>
+<tr><th>2000</th><!-- note --><td>NFL</td><td>346</td></tr>
+<tr><th colspan="2">1999</th><td>392</td></tr>
+<tr><th>Year</th><td>Lg</td><td>PF</td></tr>
+<tr><th>1998</th><td>330</td></tr>
+</tbody>
+</table>
+</body></html>
+"""
+
+def test_colspan_cells_fill_every_column_they_span():
+    df = extract_table(PAGE, "team_index")
+
+    assert df["Year"].tolist() == [2001, 2000, 1999]
+    assert df["Lg"].tolist() == ["NFL", "NFL", "1999"]
+    assert df["PF"].tolist() == [336, 346, 392]
+
+def test_rows_that_do_not_fit_are_counted(capsys):
+    df = extract_table(PAGE, "team_index")
+
+    assert df.attrs["skipped_rows"] == 1
+    assert "skipped 1 rows" in capsys.readouterr().out
+
+def test_matches_read_html_on_colspans():
+    from io import StringIO
+    expected = pd.read_html(StringIO(PAGE.replace('<tr><th>1998</th><td>330</td></tr>', "")))[0]
+    expected.columns = expected.columns.get_level_values(-1)
+    expected = expected[expected["Year"].astype(str).str.isnumeric()].reset_index(drop=True)
+
+    df = extract_table(PAGE, "team_index")
+    assert df.astype(str).values.tolist() == expected.astype(str).values.tolist()
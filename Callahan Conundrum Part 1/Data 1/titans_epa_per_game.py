@@ -1,44 +1,34 @@
 #EPA/play per game for Titans offense and defense
 
+import sys
 import pandas as pd
 import numpy as np
-from nfl_data_py import import_pbp_data
+from team_games import update_team_games, team_games
+from arrow_store import publish
+from metrics_store import publish_metrics
 import matplotlib.pyplot as plt
 
 # -----------------------------
-# 1. Load play-by-play data
+# 1. Load game-level data
 # -----------------------------
 seasons = [2023, 2024]
-pbp = import_pbp_data(seasons)
 
-# Filter for Titans drives
-pbp_titans = pbp[(pbp['posteam'] == 'TEN') | (pbp['defteam'] == 'TEN')].copy()
+# Adds any missing (or in-progress) season to the league game table, then
+# reads the Titans rows; no play-by-play is touched once the table is built
+missing = update_team_games(seasons, workers=1)
+if missing:
+    # Never write a CSV with seasons silently left out
+    print(f"\nMissing {len(missing)} of {len(seasons)} seasons: {missing}")
+    print("titans_epa_per_game.csv was not written; run again once they can be fetched.")
+    sys.exit(1)
+games = team_games('TEN', seasons)
 
 # -----------------------------
-# 2. Compute game-level EPA
+# 2. Split offense and defense
 # -----------------------------
-# Offense EPA per play (Titans as posteam)
-off = (
-    pbp_titans[pbp_titans['posteam'] == 'TEN']
-    .groupby(['season', 'game_id'])
-    .agg(off_epa_game=('epa', 'mean'))
-    .reset_index()
-)
-
-# Defense EPA per play (Titans as defteam)
-defn = (
-    pbp_titans[pbp_titans['defteam'] == 'TEN']
-    .groupby(['season', 'game_id'])
-    .agg(def_epa_game=('epa', 'mean'))
-    .reset_index()
-)
-
-# Sort and add week number
-off = off.sort_values(['season', 'game_id'])
-off['week'] = off.groupby('season').cumcount() + 1
-
-defn = defn.sort_values(['season', 'game_id'])
-defn['week'] = defn.groupby('season').cumcount() + 1
+# Week comes from the game id, so bye weeks are not renumbered
+off = games[['season', 'game_id', 'off_epa_game', 'week']].copy()
+defn = games[['season', 'game_id', 'def_epa_game', 'week']].copy()
 
 # -----------------------------
 # 3. Compute 3-game rolling average
@@ -72,3 +62,5 @@ for season in seasons:
 # 6. Save CSV
 # -----------------------------
 combined.to_csv("titans_epa_per_game.csv", index=False)
+publish("titans_epa_per_game.csv")
+publish_metrics("titans_epa_per_game.csv")
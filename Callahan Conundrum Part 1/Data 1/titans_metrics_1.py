@@ -1,130 +1,164 @@
 # titans_season_metrics.py
 import os
+import sys
 import pandas as pd
-import numpy as np
-from nfl_data_py import import_pbp_data
+
+from pbp_cache import (
+    load_pbp, iter_pbp_chunks, ensure_partition, needs_fetch, load_neutral_baseline,
+    prefetch_seasons, EMPTY,
+)
+from nfl_calendar import current_season
+from pbp_loader import run_seasons, default_workers
+from team_metrics import team_season_metrics, team_season_metrics_streaming, team_slice
+from season_store import upsert, seasons_to_process, write_store
+from pipeline_trace import stage, drain_events, add_events, write_trace, summary
 
 # --------------------
 # Config
 # --------------------
-YEARS = list(range(2000, 2025))
+# Through the in-progress season, which is refreshed on every run
+YEARS = list(range(2000, current_season() + 1))
 TEAM = "TEN"
 
-OUT_SEASON = "titans_metrics_1.csv"
+# Number of seasons processed at once (override with PBP_WORKERS)
+WORKERS = default_workers()
 
-# --------------------
-# Success rate helper
-# --------------------
-def compute_success(df):
-    yg = df["ydstogo"].replace(0, np.nan)
-    gained = df["yards_gained"].fillna(0)
+# Aggregate each season one Parquet row group at a time (PBP_STREAMING=1).
+# Same results, but a worker never holds more than one chunk of plays.
+STREAMING = os.environ.get("PBP_STREAMING") == "1"
 
-    s = pd.Series(False, index=df.index)
-    s |= ((df["down"] == 1) & (gained >= 0.5 * yg))
-    s |= ((df["down"] == 2) & (gained >= 0.7 * yg))
-    s |= (((df["down"] == 3) | (df["down"] == 4)) & (gained >= yg))
-    s |= (df["touchdown"] == 1)
+OUT_SEASON = "titans_metrics_1.csv"
+OUT_LEAGUE = "team_metrics_1.csv"
 
-    return s.fillna(False)
+# Seasons to recompute even if already stored (e.g. after an nflverse fix).
+# The in-progress season is always recomputed.
+REFRESH_SEASONS = []
 
-# --------------------
-# Season aggregation helpers
-# --------------------
-def season_agg_off(df):
-    early = df[df["down"].isin([1, 2])]
-
-    return pd.Series({
-        "plays": len(df),
-        "off_epa_per_play": df["epa"].mean(),
-        "off_early_epa_per_play": early["epa"].mean(),
-        "off_success_rate_pct": df["success_flag"].mean()
-    })
-
-def season_agg_def(df):
-    early = df[df["down"].isin([1, 2])]
-    return pd.Series({
-        "def_epa_per_play": df["epa"].mean(),
-        "def_early_epa_per_play": early["epa"].mean(),
-        "def_success_rate_pct": df["success_flag"].mean()
-    })
+# Per-stage timing and memory records (PBP_TRACE=trace.json, or
+# PBP_TRACE=trace.chrome.json for a chrome://tracing / Perfetto timeline)
+TRACE_FILE = os.environ.get("PBP_TRACE")
+
+# Only these play-by-play columns are read from nflverse / the cache
+PBP_COLUMNS = [
+    "season", "posteam", "defteam", "down", "ydstogo", "yards_gained",
+    "touchdown", "epa", "qtr", "score_differential", "play_type", "pass",
+    "success_flag",
+]
 
 # --------------------
-# MAIN LOOP
+# Per-season job (runs in a worker process)
 # --------------------
-for year in YEARS:
+# Returns (season_df, trace records); records travel back with the result
+# because each worker process keeps its own.
+def process_season(year):
     print(f"\nLoading {year}...")
 
-    try:
-        try:
-            pbp = import_pbp_data([year], downcast=True)
-        except TypeError:
-            pbp = import_pbp_data(year, downcast=True)
-    except Exception as e:
-        print(f"FAILED {year}: {e}")
-        continue
+    # Closed seasons come from the local cache, only the current one is downloaded.
+    # A fetched season also records a success_flag stage (see pbp_cache.py).
+    with stage("fetch", season=year) as rec:
+        rec["cached"] = not needs_fetch(year, columns=PBP_COLUMNS)
+        fetched = ensure_partition(year, columns=PBP_COLUMNS)
+        if fetched is EMPTY:
+            rec["rows"] = 0
+        elif fetched is not None:
+            rec["rows"] = len(fetched)
+    if fetched is EMPTY:
+        print(f"No data for {year}")
+        return None, drain_events()
 
-    if pbp is None or len(pbp) == 0:
+    # League neutral pass rate for PROE, built once per season and cached
+    with stage("proe_baseline", season=year) as rec:
+        baseline = load_neutral_baseline(year)
+        rec["rows"] = None if baseline is None else len(baseline)
+    if baseline is None:
         print(f"No data for {year}")
-        continue
-
-    pbp["season"] = year
-
-    # --------------------
-    # Offense universe
-    # --------------------
-    ten_off = pbp[pbp["posteam"] == TEAM].copy()
-    if ten_off.empty:
-        print(f"No TEN offensive plays in {year}")
-        continue
-
-    ten_off["success_flag"] = compute_success(ten_off)
-
-    # Season-level offense metrics
-    season_off_df = ten_off.groupby("season").apply(season_agg_off).reset_index()
-
-    # --------------------
-    # Defense universe
-    # --------------------
-    ten_def = pbp[pbp["defteam"] == TEAM].copy()
-    ten_def["success_flag"] = compute_success(ten_def)
-    season_def_df = ten_def.groupby("season").apply(season_agg_def).reset_index()
-
-    # --------------------
-    # Merge offense + defense
-    # --------------------
-    season_df = season_off_df.merge(season_def_df, on="season")
-
-    # --------------------
-    # PROE (neutral situations only)
-    # --------------------
-    neutral = ten_off[
-        (ten_off["down"].isin([1, 2])) &
-        (ten_off["ydstogo"] <= 10) &
-        (ten_off["qtr"] <= 3) &
-        (ten_off["score_differential"].between(-10, 10)) &
-        (ten_off["play_type"].isin(["run", "pass"]))
-    ]
-
-    league_neutral = pbp[
-        (pbp["down"].isin([1, 2])) &
-        (pbp["ydstogo"] <= 10) &
-        (pbp["qtr"] <= 3) &
-        (pbp["score_differential"].between(-10, 10)) &
-        (pbp["play_type"].isin(["run", "pass"]))
-    ]
-
-    actual_pass_rate = neutral["pass"].mean()
-    expected_pass_rate = league_neutral["pass"].mean()
-
-    season_df["proe_pct_points"] = (actual_pass_rate - expected_pass_rate) * 100
-
-
-    season_df.to_csv(
-        OUT_SEASON,
-        mode="a",
-        index=False,
-        header=not os.path.exists(OUT_SEASON)
-    )
-
-print("\nDone.")
-print(f"- {OUT_SEASON}")
\ No newline at end of file
+        return None, drain_events()
+
+    if STREAMING:
+        with stage("aggregate_streaming", season=year, team=TEAM) as rec:
+            chunks = iter_pbp_chunks(year, columns=PBP_COLUMNS)
+            season_df = team_season_metrics_streaming(chunks, baseline=baseline)
+            rec["rows"] = None if season_df is None else len(season_df)
+            rec["team_rows"] = None if season_df is None else len(team_slice(season_df, TEAM))
+        if season_df is None:
+            print(f"No data for {year}")
+            return None, drain_events()
+    else:
+        with stage("load", season=year) as rec:
+            pbp = load_pbp(year, columns=PBP_COLUMNS)
+            rec["rows"] = None if pbp is None else len(pbp)
+
+        if pbp is None or len(pbp) == 0:
+            print(f"No data for {year}")
+            return None, drain_events()
+
+        pbp["season"] = year
+
+        # Every team-season in one grouped pass; TEN is a slice of this table
+        with stage("aggregate", season=year, team=TEAM) as rec:
+            season_df = team_season_metrics(pbp, baseline=baseline)
+            rec["rows"] = len(season_df)
+            rec["team_rows"] = len(team_slice(season_df, TEAM))
+
+    if rec["team_rows"] == 0:
+        print(f"No {TEAM} offensive plays in {year}")
+
+    return season_df, drain_events()
+
+# --------------------
+# MAIN
+# --------------------
+def main():
+    # Only seasons missing from the store, or still changing, are rebuilt
+    stale = REFRESH_SEASONS + [current_season()]
+    todo = seasons_to_process(OUT_LEAGUE, YEARS, stale=stale)
+    print(f"Processing {len(todo)} of {len(YEARS)} seasons: {todo}")
+    if not todo:
+        return 0
+
+    # Season files are downloaded first (PBP_MAX_IN_FLIGHT at a time, with
+    # retries), so the workers below only read local files
+    failed = prefetch_seasons(todo, columns=PBP_COLUMNS)
+    for year, error in sorted(failed.items()):
+        print(f"FAILED {year}: {error}")
+
+    # Seasons are processed concurrently, then stored in year order
+    results = run_seasons([y for y in todo if y not in failed], process_season, workers=WORKERS)
+
+    season_dfs = []
+    for _, (season_df, events) in results:
+        add_events(events)
+        if season_df is not None:
+            season_dfs.append(season_df)
+
+    # Every season asked for either lands in the store or is reported here
+    done = {int(df["season"].iloc[0]) for df in season_dfs}
+    missing = [y for y in todo if y not in done]
+
+    if season_dfs:
+        with stage("write") as rec:
+            new_rows = pd.concat(season_dfs, ignore_index=True)
+            league = upsert(OUT_LEAGUE, new_rows, keys=["season", "team"])
+
+            # The TEN file is always rewritten as a slice of the keyed league table
+            write_store(team_slice(league, TEAM), OUT_SEASON)
+            rec["rows"] = len(league)
+
+    if TRACE_FILE:
+        write_trace(TRACE_FILE)
+        print(f"\nStage totals (trace in {TRACE_FILE}):")
+        for name, t in summary().items():
+            print(f"  {name:<20} calls={t['calls']:<3} wall={t['wall_s']:.2f}s cpu={t['cpu_s']:.2f}s")
+
+    print("\nDone.")
+    print(f"- {OUT_LEAGUE}")
+    print(f"- {OUT_SEASON}")
+
+    if missing:
+        print(f"\nMissing {len(missing)} of {len(todo)} seasons: {missing}")
+        print("They stay out of the store until a later run fetches them.")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
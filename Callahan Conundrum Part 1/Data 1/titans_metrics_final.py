@@ -1,37 +1,46 @@
-import pandas as pd
+import os
+
+from arrow_store import read_table
+from season_store import write_store
+from metrics_store import publish_metrics
+from team_dim import load_team_dim, join_team_years
+from team_metrics import team_slice
+
+TEAM = "TEN"
 
 # --------------------
 # Load CSVs
 # --------------------
-team_years = pd.read_csv("team_years.csv")
-titans_season_metrics = pd.read_csv("titans_metrics_1.csv")
+team_years = read_table("team_years.csv")
 
-# --------------------
-# Filter team_years to Titans
-# --------------------
-titans_srs = team_years[
-    team_years["team"] == "oti"
-][["Year", "Tm", "Coaches", "OSRS", "DSRS", "SRS", "PF", "PA", "PD"]].copy()
+# team_metrics_1.csv is written by titans_metrics_1.py and is not committed.
+# Without it only the committed Titans table is joined, so team_metrics_final
+# then holds Titans rows only.
+if os.path.exists("team_metrics_1.csv"):
+    league_metrics = read_table("team_metrics_1.csv")
+else:
+    print("team_metrics_1.csv not found (run titans_metrics_1.py); using titans_metrics_1.csv")
+    league_metrics = read_table("titans_metrics_1.csv")
+    league_metrics.insert(1, "team", TEAM)
+team_dim = load_team_dim()
 
 # --------------------
-# Merge into titans_season_metrics
+# Join team_years onto every team-season
 # --------------------
-titans_season_metrics = titans_season_metrics.merge(
-    titans_srs,
-    left_on="season",
-    right_on="Year",
-    how="left"
-)
+# nflverse abbreviations (TEN, LV, LAC, ...) are matched to PFR codes
+# (oti, rai, sdg, ...) season by season through the team dimension
+SRS_COLUMNS = ["Tm", "Coaches", "OSRS", "DSRS", "SRS", "PF", "PA", "PD"]
 
-# Drop duplicate Year column after merge
-titans_season_metrics.drop(columns=["Year"], inplace=True)
+league_final = join_team_years(league_metrics, team_years, columns=SRS_COLUMNS, dim=team_dim)
 
 # --------------------
-# Save updated CSV
+# Save updated CSVs
 # --------------------
-titans_season_metrics.to_csv(
-    "titans_metrics_final.csv",
-    index=False
-)
+write_store(league_final, "team_metrics_final.csv")
+write_store(team_slice(league_final, TEAM), "titans_metrics_final.csv")
+
+# Typed Parquet copies for the chart scripts (see metrics_store.py)
+publish_metrics("team_metrics_final.csv")
+publish_metrics("titans_metrics_final.csv")
 
-print("OSRS, DSRS, SRS, PF, PA, and PD successfully added to titans_season_metrics.")
+print("OSRS, DSRS, SRS, PF, PA, and PD successfully added to team_metrics_final and titans_metrics_final.")